@@ -37,6 +37,12 @@ defmodule Zixir.ODBC do
   | `:autocommit` | Auto-commit mode (default: false) |
   | `:timeout` | Connection timeout (seconds) |
   | `:max_pool_size` | Connection pool size (default: 10) |
+  | `:packet_size` | ODBC network packet size in bytes (default: 32768, `nil` for driver default) |
+  | `:fetch_array_size` | Rows per fetch round-trip (default: sized from row width) |
+  | `:fast_executemany` | Send `execute_many/3` parameter sets as one bound array (default: true) |
+  | `:cache_ttl` | Seconds to cache `query/3` results; writes through this connection clear the cache (default: 0, disabled) |
+  | `:metadata_ttl` | Seconds to cache `tables/2` and `columns/3` results (default: 300) |
+  | `:connect_attrs` | Extra pre-connect ODBC attributes, e.g. `%{3001 => 524_288}` for Db2 `SQL_ATTR_FET_BUF_SIZE` |
 
   ## Examples
 
@@ -57,6 +63,7 @@ defmodule Zixir.ODBC do
 
   @default_timeout 30
   @default_pool_size 10
+  @default_packet_size 32_768
 
   @doc """
   Connect to an ODBC data source.
@@ -197,6 +204,10 @@ defmodule Zixir.ODBC do
   @doc """
   Execute the same query with multiple parameter sets (batch operation).
 
+  ## Options
+
+  - `:commit_every` - Commit after this many parameter sets; `nil` commits once at the end (default: 10000)
+
   ## Examples
 
       iex> {:ok, count} = Zixir.ODBC.execute_many(conn, "INSERT INTO test (id) VALUES (?)", [[1], [2], [3]])
@@ -204,13 +215,19 @@ defmodule Zixir.ODBC do
       true
 
   """
-  @spec execute_many(connection(), String.t(), [[term()]]) :: execution_result()
-  def execute_many(%{pool_id: pool_id} = _conn, sql, params_list)
+  @spec execute_many(connection(), String.t(), [[term()]], keyword()) :: execution_result()
+  def execute_many(%{pool_id: pool_id} = _conn, sql, params_list, opts \\ [])
       when is_binary(sql) and is_list(params_list) do
     start_time = System.monotonic_time(:millisecond)
     batch_count = length(params_list)
-
-    case Zixir.Python.call("odbc_bridge", "odbc_bridge.execute_many", [pool_id, sql, params_list]) do
+    commit_every = Keyword.get(opts, :commit_every, 10_000)
+
+    case Zixir.Python.call("odbc_bridge", "odbc_bridge.execute_many", [
+           pool_id,
+           sql,
+           params_list,
+           commit_every
+         ]) do
       {:ok, %{"status" => "ok", "affected_rows" => count, "batches" => _batches}} ->
         duration = System.monotonic_time(:millisecond) - start_time
         Observability.record_metric("odbc.execute_many.duration", duration, unit: :millisecond)
@@ -271,6 +288,160 @@ defmodule Zixir.ODBC do
     end
   end
 
+  @doc """
+  Fetch results with keyset pagination.
+
+  Rows are ordered by `:key` and each page starts after the key values of
+  the previous page's last row, so deep pages cost the same as the first
+  one (unlike OFFSET, which scans and discards skipped rows).
+
+  Returns the next cursor to pass as `:after`, or `nil` when there are no
+  more rows.
+
+  ## Options
+
+  - `:key` - List of key column names to order and page by (required)
+  - `:after` - Cursor returned by the previous page (default: first page)
+  - `:limit` - Maximum rows to fetch (default: 1000)
+
+  ## Examples
+
+      iex> {:ok, rows, next} = Zixir.ODBC.fetch_keyset(conn, "SELECT id FROM test", key: ["id"], limit: 10)
+      iex> is_list(rows)
+      true
+
+  """
+  @spec fetch_keyset(connection(), String.t(), keyword()) ::
+          {:ok, [map()], [term()] | nil} | {:error, term()}
+  def fetch_keyset(%{pool_id: pool_id} = _conn, sql, opts) do
+    start_time = System.monotonic_time(:millisecond)
+    key = Keyword.fetch!(opts, :key)
+    after_key = Keyword.get(opts, :after)
+    limit = Keyword.get(opts, :limit, 1000)
+
+    args = [pool_id, sql, limit, 0, key, after_key]
+
+    case Zixir.Python.call("odbc_bridge", "odbc_bridge.fetch", args) do
+      {:ok, %{"status" => "ok", "columns" => columns, "rows" => rows} = result} ->
+        duration = System.monotonic_time(:millisecond) - start_time
+        Observability.record_metric("odbc.fetch.duration", duration, unit: :millisecond)
+        next = if result["has_more"], do: result["cursor_state"], else: nil
+        {:ok, parse_rows(columns, rows), next}
+
+      {:ok, %{"status" => "error", "message" => message}} ->
+        Observability.record_metric("odbc.fetch.failure", 1)
+        {:error, message}
+
+      error ->
+        Observability.record_metric("odbc.fetch.failure", 1)
+        {:error, inspect(error)}
+    end
+  end
+
+  @doc """
+  Stream the rows of a SELECT query lazily, one batch at a time.
+
+  Only one batch is held in memory on either side of the bridge. The
+  underlying pooled connection is held until the stream is fully consumed
+  or halted.
+
+  ## Options
+
+  - `:batch_size` - Rows fetched per round-trip (default: 1000)
+
+  ## Examples
+
+      iex> stream = Zixir.ODBC.stream(conn, "SELECT id FROM test", [], batch_size: 500)
+      iex> stream |> Enum.take(1) |> is_list()
+      true
+
+  """
+  @spec stream(connection(), String.t(), [term()], keyword()) :: Enumerable.t()
+  def stream(%{pool_id: pool_id} = _conn, sql, params \\ [], opts \\ [])
+      when is_binary(sql) and is_list(params) do
+    batch_size = Keyword.get(opts, :batch_size, 1000)
+
+    Stream.resource(
+      fn ->
+        case Zixir.Python.call("odbc_bridge", "odbc_bridge.open_stream", [
+               pool_id,
+               sql,
+               params,
+               batch_size
+             ]) do
+          {:ok, %{"status" => "ok", "stream_id" => stream_id}} ->
+            stream_id
+
+          {:ok, %{"status" => "error", "message" => message}} ->
+            raise "ODBC stream failed: #{message}"
+
+          error ->
+            raise "ODBC stream error: #{inspect(error)}"
+        end
+      end,
+      fn
+        nil ->
+          {:halt, nil}
+
+        stream_id ->
+          case Zixir.Python.call("odbc_bridge", "odbc_bridge.next_batch", [stream_id]) do
+            {:ok, %{"status" => "ok", "done" => true}} ->
+              {:halt, nil}
+
+            {:ok, %{"status" => "ok", "columns" => columns, "rows" => rows}} ->
+              {parse_rows(columns, rows), stream_id}
+
+            {:ok, %{"status" => "error", "message" => message}} ->
+              raise "ODBC stream failed: #{message}"
+
+            error ->
+              raise "ODBC stream error: #{inspect(error)}"
+          end
+      end,
+      fn
+        nil -> :ok
+        stream_id -> Zixir.Python.call("odbc_bridge", "odbc_bridge.close_stream", [stream_id])
+      end
+    )
+  end
+
+  @doc """
+  Execute a SELECT query and return the result as an Arrow IPC stream.
+
+  Uses `arrow-odbc` column-wise binding, so the driver fills contiguous
+  column buffers instead of building one Python object per cell. Requires
+  `pip install arrow-odbc pyarrow` on the Python side.
+
+  ## Examples
+
+      iex> {:ok, ipc, row_count} = Zixir.ODBC.fetch_arrow(conn, "SELECT 1 as id")
+      iex> is_binary(ipc)
+      true
+
+  """
+  @spec fetch_arrow(connection(), String.t()) ::
+          {:ok, binary(), non_neg_integer()} | {:error, term()}
+  def fetch_arrow(%{pool_id: pool_id} = _conn, sql) when is_binary(sql) do
+    start_time = System.monotonic_time(:millisecond)
+
+    case Zixir.Python.call("odbc_bridge", "odbc_bridge.fetch_arrow", [pool_id, sql]) do
+      {:ok, %{"status" => "ok", "data" => data, "row_count" => count}} ->
+        duration = System.monotonic_time(:millisecond) - start_time
+        Observability.record_metric("odbc.fetch_arrow.duration", duration, unit: :millisecond)
+        Observability.record_metric("odbc.fetch_arrow.rows_returned", count)
+        {:ok, decode_binary(data), count}
+
+      {:ok, %{"status" => "error", "message" => message}} ->
+        Observability.record_metric("odbc.fetch_arrow.failure", 1)
+        Logger.error("ODBC fetch_arrow failed: #{message}")
+        {:error, message}
+
+      error ->
+        Observability.record_metric("odbc.fetch_arrow.failure", 1)
+        {:error, inspect(error)}
+    end
+  end
+
   @doc """
   Execute multiple operations in a single transaction.
 
@@ -423,7 +594,13 @@ defmodule Zixir.ODBC do
       port: Keyword.get(opts, :port),
       autocommit: Keyword.get(opts, :autocommit, false),
       timeout: Keyword.get(opts, :timeout, @default_timeout),
-      max_pool_size: Keyword.get(opts, :max_pool_size, @default_pool_size)
+      max_pool_size: Keyword.get(opts, :max_pool_size, @default_pool_size),
+      packet_size: Keyword.get(opts, :packet_size, @default_packet_size),
+      fetch_array_size: Keyword.get(opts, :fetch_array_size),
+      fast_executemany: Keyword.get(opts, :fast_executemany, true),
+      cache_ttl: Keyword.get(opts, :cache_ttl, 0),
+      metadata_ttl: Keyword.get(opts, :metadata_ttl, 300),
+      connect_attrs: Keyword.get(opts, :connect_attrs, %{})
     }
   end
 
@@ -434,4 +611,7 @@ defmodule Zixir.ODBC do
   end
 
   defp parse_rows(_, rows), do: rows
+
+  defp decode_binary(%{"__bytes__" => encoded}), do: Base.decode64!(encoded)
+  defp decode_binary(data) when is_binary(data), do: data
 end
@@ -0,0 +1,61 @@
+"""
+Vector scoring kernels for the Python vector database backends.
+
+Each kernel scores one query vector against every row of a float32 matrix
+and writes the scores into a preallocated output array. When numba is
+installed the kernels are JIT-compiled and parallelized across rows;
+otherwise equivalent NumPy implementations are used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def cosine_vector_to_matrix(u, M, out):
+        """Cosine similarity of u against each row of M; zero-norm rows score 0."""
+        u_norm = 0.0
+        for j in range(u.shape[0]):
+            u_norm += u[j] * u[j]
+        u_norm = np.sqrt(u_norm)
+
+        for i in prange(M.shape[0]):
+            dot = 0.0
+            m_norm = 0.0
+            for j in range(M.shape[1]):
+                dot += M[i, j] * u[j]
+                m_norm += M[i, j] * M[i, j]
+            denom = u_norm * np.sqrt(m_norm)
+            out[i] = dot / denom if denom > 0.0 else 0.0
+        return out
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def dot_vector_to_matrix(u, M, out):
+        """Dot product of u against each row of M (cosine for pre-normalized inputs)."""
+        for i in prange(M.shape[0]):
+            dot = 0.0
+            for j in range(M.shape[1]):
+                dot += M[i, j] * u[j]
+            out[i] = dot
+        return out
+
+else:
+
+    def cosine_vector_to_matrix(u, M, out):
+        """Cosine similarity of u against each row of M; zero-norm rows score 0."""
+        denom = np.linalg.norm(M, axis=1) * np.linalg.norm(u)
+        np.matmul(M, u, out=out)
+        np.divide(out, denom, out=out, where=denom > 0)
+        out[denom == 0] = 0.0
+        return out
+
+    def dot_vector_to_matrix(u, M, out):
+        """Dot product of u against each row of M (cosine for pre-normalized inputs)."""
+        return np.matmul(M, u, out=out)
@@ -6,15 +6,21 @@ query optimization, and automatic type conversion.
 """
 
 import os
+import re
 import json
 import threading
 import uuid
+import time
 import hashlib
-from typing import Dict, List, Any, Optional
+import weakref
+from itertools import islice
+from typing import Dict, List, Any, Optional, Iterator, Mapping
 from dataclasses import dataclass, field
-from datetime import datetime, date
+from datetime import datetime, date, time as dt_time
 from decimal import Decimal
 import logging
+from collections import deque, OrderedDict
+from types import MappingProxyType
 
 try:
     import pyodbc
@@ -22,16 +28,57 @@ try:
 except ImportError:
     PYODBC_AVAILABLE = False
 
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+try:
+    import pyarrow as pa
+    from arrow_odbc import read_arrow_batches_from_odbc
+    ARROW_ODBC_AVAILABLE = True
+except ImportError:
+    ARROW_ODBC_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Target size of one fetchmany() batch; the row count is derived from the row width.
+FETCH_BUFFER_BYTES = 64 * 1024
+# Upper bound for a single Arrow record batch filled by the driver.
+ARROW_MAX_BYTES_PER_BATCH = 2 ** 20
+# ODBC connection attribute, must be set before the connection is opened.
+SQL_ATTR_PACKET_SIZE = 112
+# Prepared cursors kept per connection.
+STATEMENT_CACHE_SIZE = 128
+# Rows per transaction in execute_many; bounds lock hold time and log growth.
+COMMIT_EVERY = 10000
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 
 @dataclass
 class ConnectionConfig:
-    """ODBC connection configuration."""
+    """
+    ODBC connection configuration.
+
+    packet_size is applied as SQL_ATTR_PACKET_SIZE before connecting (None
+    disables it). fetch_array_size fixes the number of rows requested per
+    fetch round-trip; when None it is derived from the result row width.
+    fast_executemany sends execute_many parameter sets as one bound array;
+    disable it for drivers that do not support parameter arrays.
+    cache_ttl caches query() results for that many seconds (0 disables).
+    metadata_ttl caches tables()/columns() catalog results (0 disables).
+    connect_attrs passes extra pre-connect attributes to the driver, e.g.
+    {3001: 524288} sets SQL_ATTR_FET_BUF_SIZE on IBM Db2 DSNs.
+    """
     dsn: Optional[str] = None
-    connection_string: Optional[str] = None
+    connection_string: Optional[str] = field(default=None, repr=False)
     username: Optional[str] = None
-    password: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
     host: Optional[str] = None
     database: Optional[str] = None
     driver: Optional[str] = None
@@ -40,71 +87,333 @@ class ConnectionConfig:
     timeout: int = 30
     max_pool_size: int = 10
     pool_timeout: int = 30
+    packet_size: Optional[int] = 32768
+    fetch_array_size: Optional[int] = None
+    fast_executemany: bool = True
+    cache_ttl: float = 0.0
+    metadata_ttl: float = 300.0
+    connect_attrs: Dict[int, Any] = field(default_factory=dict)
+    _conn_str: str = field(init=False, repr=False, default="")
+
+    def __post_init__(self):
+        if self.connection_string:
+            self._conn_str = self.connection_string
+        elif self.dsn:
+            self._conn_str = f"DSN={self.dsn}"
+        else:
+            self._conn_str = ";".join(filter(None, [
+                self.driver and f"DRIVER={self.driver}",
+                self.host and f"SERVER={self.host}",
+                self.database and f"DATABASE={self.database}",
+                self.username and f"UID={self.username}",
+                self.password and f"PWD={self.password}",
+                self.port and f"PORT={self.port}",
+            ]))
 
 
 @dataclass
 class QueryResult:
     """Query execution result."""
-    rows: List[Dict[str, Any]]
+    rows: List[tuple]
     columns: List[str]
     row_count: int
     affected_rows: int = 0
 
 
+class PreparedStatement:
+    """A cached cursor plus the result-set layout of its last execution."""
+
+    __slots__ = ("cursor", "description", "col_names", "col_decoders")
+
+    def __init__(self, cursor: Any):
+        self.cursor = cursor
+        self.description = None
+        self.col_names = None
+        self.col_decoders = ()
+
+
+class StatementCache:
+    """
+    LRU of pyodbc cursors for one connection, keyed by a digest of the SQL text.
+
+    pyodbc keeps the prepared statement on a cursor when it re-executes
+    identical SQL, so handing back the same cursor for the same statement
+    skips re-parsing and re-planning on the server. The column layout is
+    cached with it and rebuilt only when the driver reports a different
+    description.
+
+    Because cursors outlive the request that used them, every cursor handed
+    out is remembered until release_results() discards whatever it left
+    unread; drivers without MARS refuse a statement on one cursor while
+    another still has pending results.
+    """
+
+    def __init__(self, conn: Any, max_size: int = STATEMENT_CACHE_SIZE):
+        self._conn = conn
+        self.max_size = max_size
+        self._statements: OrderedDict = OrderedDict()
+        self._used: Dict[int, Any] = {}
+
+    def statement_for(self, sql: str) -> PreparedStatement:
+        """Get the cached statement for sql, preparing a new cursor on miss."""
+        key = hashlib.blake2b(sql.encode(), digest_size=16).digest()
+        stmt = self._statements.get(key)
+        if stmt is not None:
+            self._statements.move_to_end(key)
+            self._used[id(stmt.cursor)] = stmt.cursor
+            return stmt
+
+        stmt = PreparedStatement(self._conn.cursor())
+        self._statements[key] = stmt
+        self._used[id(stmt.cursor)] = stmt.cursor
+        if len(self._statements) > self.max_size:
+            _, evicted = self._statements.popitem(last=False)
+            self._used.pop(id(evicted.cursor), None)
+            try:
+                evicted.cursor.close()
+            except Exception:
+                pass
+        return stmt
+
+    def cursor_for(self, sql: str) -> Any:
+        """Get the cached cursor for sql."""
+        return self.statement_for(sql).cursor
+
+    def release_results(self):
+        """
+        Discard the unread result sets of every cursor used since the last call.
+
+        nextset() skips to the end of the pending results while keeping the
+        statement prepared; cancel() is the fallback for drivers that reject it.
+        """
+        used, self._used = self._used, {}
+        for cursor in used.values():
+            try:
+                while cursor.nextset():
+                    pass
+            except Exception:
+                try:
+                    cursor.cancel()
+                except Exception:
+                    pass
+
+    def clear(self):
+        """Close all cached cursors."""
+        self._used.clear()
+        for stmt in self._statements.values():
+            try:
+                stmt.cursor.close()
+            except Exception:
+                pass
+        self._statements.clear()
+
+
+class ResultCache:
+    """
+    TTL + LRU cache of read query results, keyed by a digest of (sql, params).
+
+    Writes issued through the bridge clear the whole cache; writes made by
+    other clients become visible once the TTL expires. A ttl of 0 disables
+    caching. clear() bumps generation, so a read that was already running
+    when a write cleared the cache does not store its stale result.
+    """
+
+    def __init__(self, ttl: float = 0.0, max_size: int = 256):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(sql: str, params: Optional[List[Any]]) -> bytes:
+        """Digest the SQL text and its bind parameters."""
+        payload = sql.encode() + b"\0" + json.dumps(params or [], sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: bytes, value: Dict[str, Any], generation: Optional[int] = None):
+        """Cache a result for ttl seconds, unless the cache was cleared since generation was read."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+
 class ConnectionPool:
-    """ODBC connection pool manager."""
+    """
+    ODBC connection pool manager.
+
+    Idle connections are reused LIFO so the most recently used connection
+    (warmest driver-side statement cache) is handed out first. Each thread
+    keeps one idle connection in a thread-local slot, so a worker that
+    repeatedly acquires and releases never touches the shared lock. Slots
+    are also registered with the pool, so when the shared idle list runs
+    dry another thread takes a connection parked in one of them rather
+    than reporting the pool exhausted. The idle list is a deque and each
+    slot a list, whose append/pop are atomic in CPython; the lock only
+    guards registering slots, growing the pool and teardown.
+    """
 
     def __init__(self, config: ConnectionConfig, pool_id: str):
         self.config = config
         self.pool_id = pool_id
-        self._pool: List[Any] = []
+        self._pool: deque = deque()
+        self._connections: List[Any] = []
+        self._statements: Dict[int, StatementCache] = {}
+        self.results = ResultCache(config.cache_ttl)
+        self.metadata = ResultCache(config.metadata_ttl)
         self._lock = threading.Lock()
+        self._tls = threading.local()
+        self._slots: List[List[Any]] = []
         self._active = 0
 
+    def _slot(self) -> List[Any]:
+        """This thread's idle-connection slot, holding at most one connection."""
+        slot = getattr(self._tls, "slot", None)
+        if slot is None:
+            slot = self._tls.slot = []
+            with self._lock:
+                self._slots.append(slot)
+        return slot
+
     def get_connection(self) -> 'PooledConnection':
         """Acquire connection from pool."""
+        try:
+            return PooledConnection(self._slot().pop(), self)
+        except IndexError:
+            pass
+
+        try:
+            return PooledConnection(self._pool.pop(), self)
+        except IndexError:
+            pass
+
+        for slot in list(self._slots):
+            try:
+                return PooledConnection(slot.pop(), self)
+            except IndexError:
+                pass
+
         with self._lock:
-            if self._pool:
-                conn = self._pool.pop()
-            else:
-                if self._active >= self.config.max_pool_size:
-                    raise PoolExhaustedError(
-                        f"Connection pool exhausted. Active: {self._active}, Max: {self.config.max_pool_size}"
-                    )
-                conn = self._create_connection()
-                self._active += 1
-            return PooledConnection(conn, self)
+            if self._active >= self.config.max_pool_size:
+                raise PoolExhaustedError(
+                    f"Connection pool exhausted. Active: {self._active}, Max: {self.config.max_pool_size}"
+                )
+            self._active += 1
+
+        try:
+            conn = self._create_connection()
+        except Exception:
+            with self._lock:
+                self._active -= 1
+            raise
+
+        with self._lock:
+            self._connections.append(conn)
+            self._statements[id(conn)] = StatementCache(conn)
+        return PooledConnection(conn, self)
+
+    def invalidate_caches(self):
+        """Drop cached query and catalog results after a write."""
+        self.results.clear()
+        self.metadata.clear()
+
+    def statement_cache(self, conn: Any) -> StatementCache:
+        """Get the prepared-statement cache belonging to a raw connection."""
+        return self._statements[id(conn)]
+
+    def release_results(self, conn: Any):
+        """Discard results left pending on a raw connection's cached cursors."""
+        statements = self._statements.get(id(conn))
+        if statements is not None:
+            statements.release_results()
+
+    @property
+    def connection_string(self) -> str:
+        """ODBC connection string for this pool."""
+        return self.config._conn_str
 
     def return_connection(self, conn: 'PooledConnection'):
-        """Return connection to pool."""
+        """Return connection to the thread-local slot, or the shared pool if it is taken."""
+        if self._active <= 0:
+            return
+
+        slot = self._slot()
+        if not slot:
+            slot.append(conn._conn)
+            return
+
+        self._pool.append(conn._conn)
+
+    def _on_leak(self, conn: Any):
+        """Reclaim a connection whose PooledConnection was garbage collected without close()."""
+        if id(conn) not in self._statements:
+            return
+        logger.warning(f"ODBC connection leaked from pool {self.pool_id}; returning it to the pool")
+        self.release_results(conn)
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        self._pool.append(conn)
+
+    def close_all(self):
+        """Close every connection created by this pool, including thread-local ones."""
         with self._lock:
-            if self._active > 0:
-                self._pool.append(conn)
+            for statements in self._statements.values():
+                statements.clear()
+            self._statements.clear()
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+            self._pool.clear()
+            self._active = 0
+            for slot in self._slots:
+                slot.clear()
+            self._slots = []
+            self._tls = threading.local()
 
     def _create_connection(self) -> Any:
         """Create new ODBC connection."""
-        if self.config.connection_string:
-            conn_str = self.config.connection_string
-        elif self.config.dsn:
-            conn_str = f"DSN={self.config.dsn}"
-        else:
-            parts = []
-            if self.config.driver:
-                parts.append(f"DRIVER={self.config.driver}")
-            if self.config.host:
-                parts.append(f"SERVER={self.config.host}")
-            if self.config.database:
-                parts.append(f"DATABASE={self.config.database}")
-            if self.config.username:
-                parts.append(f"UID={self.config.username}")
-            if self.config.password:
-                parts.append(f"PWD={self.config.password}")
-            if self.config.port:
-                parts.append(f"PORT={self.config.port}")
-            conn_str = ";".join(parts)
+        attrs_before = dict(self.config.connect_attrs)
+        if self.config.packet_size:
+            attrs_before[SQL_ATTR_PACKET_SIZE] = self.config.packet_size
 
         try:
-            conn = pyodbc.connect(conn_str, timeout=self.config.timeout)
+            conn = pyodbc.connect(
+                self.connection_string,
+                timeout=self.config.timeout,
+                attrs_before=attrs_before or None
+            )
             conn.autocommit = self.config.autocommit
             return conn
         except Exception as e:
@@ -114,33 +423,59 @@ class ConnectionPool:
     @property
     def active_count(self) -> int:
         """Get number of active connections."""
-        with self._lock:
-            return self._active
+        return self._active
 
     @property
     def available_count(self) -> int:
         """Get number of available connections in pool."""
-        with self._lock:
-            return len(self._pool)
+        return len(self._pool) + sum(len(slot) for slot in list(self._slots))
 
 
 class PooledConnection:
-    """Wrapper for pooled ODBC connection."""
+    """
+    Wrapper for pooled ODBC connection.
+
+    Use it as a context manager so the connection is returned on exit; an
+    exception leaving the block rolls back the open transaction first, so no
+    half-done writes ride along into the next request. A wrapper that is
+    garbage collected without being closed has its connection rolled back
+    and handed back to the pool with a warning.
+    """
 
     def __init__(self, conn: Any, pool: ConnectionPool):
         self._conn = conn
         self._pool = pool
         self._closed = False
+        self._cursor = None
+        self._finalizer = weakref.finalize(self, pool._on_leak, conn)
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._pool.release_results(self._conn)
+            try:
+                self._conn.rollback()
+            except Exception:
+                pass
+        self.close()
 
     @property
     def cursor(self) -> 'TypeConvertingCursor':
-        """Get cursor with automatic type conversion."""
-        cursor = self._conn.cursor()
-        return TypeConvertingCursor(cursor)
+        """Get cursor with automatic type conversion, backed by the connection's statement cache."""
+        if self._cursor is None:
+            self._cursor = TypeConvertingCursor(
+                self._pool.statement_cache(self._conn),
+                self._pool.config.fetch_array_size
+            )
+        return self._cursor
 
     def close(self):
-        """Return to pool instead of closing."""
+        """Discard pending results and return to pool instead of closing."""
         if not self._closed:
+            self._finalizer.detach()
+            self._pool.release_results(self._conn)
             self._pool.return_connection(self)
             self._closed = True
 
@@ -154,73 +489,158 @@ class PooledConnection:
 
     @property
     def connected(self) -> bool:
-        """Check if connection is still connected."""
+        """Check if connection is still connected, reusing the cached SELECT 1 cursor."""
         try:
-            self._conn.cursor()
+            cursor = self._pool.statement_cache(self._conn).cursor_for("SELECT 1")
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
             return True
-        except:
+        except pyodbc.Error:
             return False
 
 
+# pyodbc reports the Python type of each column in description[i][1];
+# values of these types are passed through without per-cell checks.
+_PASSTHROUGH_TYPES = frozenset({str, int, float, bool, Decimal, datetime, date, dt_time})
+
+
+def _decode_bytes(val: bytes) -> str:
+    """Decode binary column data as UTF-8, falling back to lossless latin-1."""
+    try:
+        return val.decode('utf-8')
+    except UnicodeDecodeError:
+        return val.decode('latin-1')
+
+
+def _decode_binary(val: Optional[bytes]) -> Optional[str]:
+    """Decode a cell of a binary column."""
+    if val is None:
+        return None
+    return _decode_bytes(bytes(val))
+
+
+def _decode_cell(val: Any) -> Any:
+    """Decode a cell of a column of unknown type that may return bytes."""
+    if isinstance(val, (bytes, bytearray)):
+        return _decode_bytes(bytes(val))
+    return val
+
+
+# Per-column decoders keyed by the description[i][1] type; columns of other
+# non-passthrough types fall back to a per-cell check with _decode_cell.
+_COLUMN_DECODERS = {
+    bytes: _decode_binary,
+    bytearray: _decode_binary,
+}
+
+
+def _chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most size items."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _isoformat(param: Any) -> str:
+    return param.isoformat()
+
+
+# Parameter conversions dispatched on the exact type. bool must map to int
+# here explicitly: it is an int subclass, so an isinstance chain has to test
+# it before the numeric types.
+_PARAM_CONVERTERS = {
+    datetime: _isoformat,
+    date: _isoformat,
+    Decimal: float,
+    list: _json_dumps,
+    dict: _json_dumps,
+    bool: int,
+}
+
+
 class TypeConvertingCursor:
     """Cursor with automatic type conversion."""
 
-    TYPE_MAP = {
-        pyodbc.SQL_CHAR: str,
-        pyodbc.SQL_VARCHAR: str,
-        pyodbc.SQL_LONGVARCHAR: str,
-        pyodbc.SQL_DECIMAL: Decimal,
-        pyodbc.SQL_NUMERIC: Decimal,
-        pyodbc.SQL_INTEGER: int,
-        pyodbc.SQL_SMALLINT: int,
-        pyodbc.SQL_FLOAT: float,
-        pyodbc.SQL_REAL: float,
-        pyodbc.SQL_DOUBLE: float,
-        pyodbc.SQL_DATETIME: datetime,
-        pyodbc.SQL_DATE: date,
-        pyodbc.SQL_TIME: datetime,
-        pyodbc.SQL_TIMESTAMP: datetime,
-        pyodbc.SQL_BIT: bool,
-    }
-
-    def __init__(self, cursor: Any):
-        self._cursor = cursor
+    def __init__(self, statements: StatementCache, fetch_array_size: Optional[int] = None):
+        self._statements = statements
+        self._cursor = None
         self._description = None
+        self._col_names = ()
+        self._col_decoders = ()
+        self._fetch_array_size = fetch_array_size
 
     def execute(self, sql: str, params: Optional[List[Any]] = None):
-        """Execute query with parameter substitution."""
+        """Execute query with parameter substitution on the cached cursor for sql."""
         try:
             if params:
                 processed_params = [self._convert_param(p) for p in params]
             else:
                 processed_params = None
 
+            stmt = self._statements.statement_for(sql)
+            self._cursor = stmt.cursor
             self._cursor.execute(sql, processed_params or [])
-            self._description = self._cursor.description
+            # The layout can change under a cached statement (e.g. SELECT * after
+            # ALTER TABLE), so reuse the decoders only while the description matches.
+            description = self._cursor.description
+            if stmt.col_names is None or description != stmt.description:
+                self._describe(stmt, description)
+            self._description = stmt.description
+            self._col_names = stmt.col_names
+            self._col_decoders = stmt.col_decoders
             return self
         except Exception as e:
             logger.error(f"Execute failed: {e}")
             raise
 
-    def fetchone(self) -> Optional[Dict[str, Any]]:
+    def executemany(self, sql: str, params_list: List[List[Any]]):
+        """
+        Execute sql once per parameter set using pyodbc's fast_executemany.
+
+        Parameters are bound column-wise as arrays and sent in a single
+        SQLExecute (SQL_ATTR_PARAMSET_SIZE), instead of one round-trip per row.
+        """
+        try:
+            converted = [[self._convert_param(p) for p in params] for params in params_list]
+
+            self._cursor = self._statements.cursor_for(sql)
+            self._cursor.fast_executemany = True
+            self._cursor.executemany(sql, converted)
+            self._description = None
+            self._col_names = ()
+            self._col_decoders = ()
+            return self
+        except Exception as e:
+            logger.error(f"Executemany failed: {e}")
+            raise
+
+    def fetchone(self) -> Optional[tuple]:
         """Fetch single row."""
         row = self._cursor.fetchone()
         if row:
-            return self._convert_row(row)
+            return self._convert_rows([row])[0]
         return None
 
-    def fetchall(self) -> List[Dict[str, Any]]:
-        """Fetch all rows."""
-        rows = self._cursor.fetchall()
-        return [self._convert_row(row) for row in rows]
+    def fetchall(self) -> List[tuple]:
+        """Fetch all rows in driver-sized batches."""
+        converted = []
+        while True:
+            rows = self._cursor.fetchmany(self._cursor.arraysize)
+            if not rows:
+                break
+            converted.extend(self._convert_rows(rows))
+        return converted
 
-    def fetchmany(self, size: Optional[int] = None) -> List[Dict[str, Any]]:
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
         """Fetch many rows."""
         if size:
             rows = self._cursor.fetchmany(size)
         else:
             rows = self._cursor.fetchmany()
-        return [self._convert_row(row) for row in rows]
+        return self._convert_rows(rows)
 
     @property
     def description(self) -> Optional[List[tuple]]:
@@ -230,42 +650,69 @@ class TypeConvertingCursor:
     @property
     def rowcount(self) -> int:
         """Get affected row count."""
-        return self._cursor.rowcount
+        return self._cursor.rowcount if self._cursor is not None else -1
 
     def _convert_param(self, param: Any) -> Any:
         """Convert parameter to database-compatible type."""
-        if param is None:
-            return None
+        convert = _PARAM_CONVERTERS.get(type(param))
+        if convert is not None:
+            return convert(param)
+        if param is None or type(param) in (str, int, float, bytes):
+            return param
+
+        # Subclasses of the converted types (e.g. OrderedDict, pandas Timestamp)
         if isinstance(param, (datetime, date)):
             return param.isoformat()
         if isinstance(param, Decimal):
             return float(param)
         if isinstance(param, (list, dict)):
-            return json.dumps(param)
-        if isinstance(param, bool):
-            return 1 if param else 0
+            return _json_dumps(param)
         return param
 
-    def _convert_row(self, row) -> Dict[str, Any]:
-        """Convert row to dict with column names."""
-        if not self._description:
-            return dict(enumerate(row))
+    @property
+    def columns(self) -> List[str]:
+        """Get result column names."""
+        return list(self._col_names)
+
+    def _describe(self, stmt: PreparedStatement, description):
+        """Record the result-set layout of a statement's latest execution."""
+        stmt.description = description
+        stmt.col_names = tuple(d[0] for d in description) if description else ()
+        stmt.col_decoders = tuple(
+            (i, _COLUMN_DECODERS.get(d[1], _decode_cell))
+            for i, d in enumerate(description or ())
+            if d[1] not in _PASSTHROUGH_TYPES
+        )
+        if self._fetch_array_size:
+            stmt.cursor.arraysize = self._fetch_array_size
+        elif description:
+            stmt.cursor.arraysize = self._batch_size(description)
+
+    @staticmethod
+    def _batch_size(description) -> int:
+        """Size fetchmany() batches to roughly FETCH_BUFFER_BYTES per round-trip."""
+        # LOB columns report huge internal sizes; cap them so batches stay useful.
+        row_width = sum(min(max(d[3] or 0, 8), 4096) for d in description)
+        return max(1, FETCH_BUFFER_BYTES // row_width)
+
+    def _convert_rows(self, rows) -> List[tuple]:
+        """
+        Convert driver rows to plain tuples in column order.
 
-        converted = {}
-        for i, (col, val) in enumerate(zip([d[0] for d in self._description], row)):
-            if val is None:
-                converted[col] = None
-            elif isinstance(val, bytes):
-                try:
-                    converted[col] = val.decode('utf-8')
-                except:
-                    try:
-                        converted[col] = val.decode('latin-1')
-                    except:
-                        converted[col] = val.hex()
-            else:
-                converted[col] = val
-        return converted
+        Column names are reported once per result (see columns) rather than
+        repeated in every row. Decoding is applied column-wise, and only to
+        columns whose declared type may yield bytes; all other columns are
+        passed through untouched.
+        """
+        if not rows:
+            return []
+
+        if self._col_decoders:
+            columns = list(zip(*rows))
+            for i, decode in self._col_decoders:
+                columns[i] = tuple(map(decode, columns[i]))
+            return list(zip(*columns))
+        return [tuple(row) for row in rows]
 
 
 class PoolExhaustedError(Exception):
@@ -285,7 +732,10 @@ class ODBCBridge:
     """
 
     def __init__(self):
-        self._pools: Dict[str, ConnectionPool] = {}
+        # Read-only snapshot, replaced wholesale under _lock by connect and
+        # disconnect, so request handlers look pools up without locking.
+        self._pools: Mapping[str, ConnectionPool] = MappingProxyType({})
+        self._streams: Dict[str, tuple] = {}
         self._lock = threading.Lock()
 
     def connect(self, config: Dict) -> Dict:
@@ -316,13 +766,22 @@ class ODBCBridge:
                 port=config.get("port"),
                 autocommit=config.get("autocommit", False),
                 timeout=config.get("timeout", 30),
-                max_pool_size=config.get("max_pool_size", 10)
+                max_pool_size=config.get("max_pool_size", 10),
+                packet_size=config.get("packet_size", 32768),
+                fetch_array_size=config.get("fetch_array_size"),
+                fast_executemany=config.get("fast_executemany", True),
+                cache_ttl=config.get("cache_ttl", 0.0),
+                metadata_ttl=config.get("metadata_ttl", 300.0),
+                connect_attrs={
+                    int(k): v for k, v in (config.get("connect_attrs") or {}).items()
+                }
             )
 
             pool_id = f"odbc_{uuid.uuid4().hex[:12]}"
 
+            pool = ConnectionPool(conn_config, pool_id)
             with self._lock:
-                self._pools[pool_id] = ConnectionPool(conn_config, pool_id)
+                self._pools = MappingProxyType({**self._pools, pool_id: pool})
 
             return {
                 "status": "ok",
@@ -343,25 +802,35 @@ class ODBCBridge:
 
     def query(self, pool_id: str, sql: str, params: Optional[List[Any]] = None) -> Dict:
         """Execute a SELECT query."""
-        if pool_id not in self._pools:
+        pool = self._pools.get(pool_id)
+        if pool is None:
             return {"status": "error", "message": "Unknown pool"}
 
-        pool = self._pools[pool_id]
-
         try:
+            cache_key = None
+            generation = pool.results.generation
+            if pool.results.enabled:
+                cache_key = ResultCache.make_key(sql, params)
+                cached = pool.results.get(cache_key)
+                if cached is not None:
+                    return cached
+
             with pool.get_connection() as conn:
                 cursor = conn.cursor
                 cursor.execute(sql, params or [])
 
                 rows = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                columns = cursor.columns
 
-                return {
+                result = {
                     "status": "ok",
                     "columns": columns,
                     "rows": rows,
                     "row_count": len(rows)
                 }
+                if cache_key is not None:
+                    pool.results.set(cache_key, result, generation)
+                return result
 
         except Exception as e:
             logger.error(f"ODBC query failed: {e}")
@@ -373,16 +842,16 @@ class ODBCBridge:
 
     def execute(self, pool_id: str, sql: str, params: Optional[List[Any]] = None) -> Dict:
         """Execute INSERT/UPDATE/DELETE."""
-        if pool_id not in self._pools:
+        pool = self._pools.get(pool_id)
+        if pool is None:
             return {"status": "error", "message": "Unknown pool"}
 
-        pool = self._pools[pool_id]
-
         try:
             with pool.get_connection() as conn:
                 cursor = conn.cursor
                 cursor.execute(sql, params or [])
                 conn.commit()
+                pool.invalidate_caches()
 
                 return {
                     "status": "ok",
@@ -397,30 +866,55 @@ class ODBCBridge:
                 "sql": sql[:200] if sql else ""
             }
 
-    def fetch(self, pool_id: str, sql: str, limit: int = 1000, offset: int = 0) -> Dict:
-        """Execute query with pagination."""
-        if pool_id not in self._pools:
-            return {"status": "error", "message": "Unknown pool"}
+    def fetch(
+        self,
+        pool_id: str,
+        sql: str,
+        limit: int = 1000,
+        offset: int = 0,
+        key_columns: Optional[List[str]] = None,
+        cursor_state: Optional[List[Any]] = None
+    ) -> Dict:
+        """
+        Execute query with pagination.
 
-        pool = self._pools[pool_id]
+        With key_columns the query is paged by keyset: rows are ordered by the
+        key and each page starts after cursor_state (the key values of the
+        previous page's last row), so every page costs the same regardless of
+        depth. The response carries the next cursor_state. Without key_columns
+        the parameterized LIMIT/OFFSET path is used.
+        """
+        pool = self._pools.get(pool_id)
+        if pool is None:
+            return {"status": "error", "message": "Unknown pool"}
 
         try:
-            paginated_sql = f"{sql} LIMIT {limit} OFFSET {offset}"
+            if key_columns:
+                paginated_sql, params = self._keyset_sql(sql, key_columns, cursor_state, limit)
+            else:
+                paginated_sql = f"{sql} LIMIT ? OFFSET ?"
+                params = [limit, offset]
 
             with pool.get_connection() as conn:
                 cursor = conn.cursor
-                cursor.execute(paginated_sql)
+                cursor.execute(paginated_sql, params)
 
-                rows = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                rows = cursor.fetchmany(limit)
+                columns = cursor.columns
 
-                return {
+                result = {
                     "status": "ok",
                     "columns": columns,
                     "rows": rows,
                     "row_count": len(rows),
                     "has_more": len(rows) == limit
                 }
+                if key_columns:
+                    last = rows[-1] if rows else None
+                    result["cursor_state"] = (
+                        [last[columns.index(k)] for k in key_columns] if last is not None else None
+                    )
+                return result
 
         except Exception as e:
             logger.error(f"ODBC fetch failed: {e}")
@@ -429,13 +923,41 @@ class ODBCBridge:
                 "message": str(e)
             }
 
+    @staticmethod
+    def _keyset_sql(
+        sql: str,
+        key_columns: List[str],
+        cursor_state: Optional[List[Any]],
+        limit: int
+    ) -> tuple:
+        """Wrap sql in a keyset page: WHERE key > cursor_state ORDER BY key LIMIT ?."""
+        for col in key_columns:
+            if not _IDENTIFIER_RE.match(col):
+                raise ValueError(f"Invalid key column: {col!r}")
+
+        params: List[Any] = []
+        where = ""
+        if cursor_state:
+            if len(cursor_state) != len(key_columns):
+                raise ValueError("cursor_state must have one value per key column")
+            # Expanded row-value comparison; (a, b) > (?, ?) is not portable.
+            clauses = []
+            for i, col in enumerate(key_columns):
+                terms = [f"{prev} = ?" for prev in key_columns[:i]] + [f"{col} > ?"]
+                clauses.append("(" + " AND ".join(terms) + ")")
+                params.extend(cursor_state[:i + 1])
+            where = " WHERE " + " OR ".join(clauses)
+
+        order_by = ", ".join(key_columns)
+        params.append(limit)
+        return f"SELECT * FROM ({sql}) AS _page{where} ORDER BY {order_by} LIMIT ?", params
+
     def transaction(self, pool_id: str, operations: List[Dict]) -> Dict:
         """Execute multiple operations in a transaction."""
-        if pool_id not in self._pools:
+        pool = self._pools.get(pool_id)
+        if pool is None:
             return {"status": "error", "message": "Unknown pool"}
 
-        pool = self._pools[pool_id]
-
         try:
             with pool.get_connection() as conn:
                 results = []
@@ -452,6 +974,7 @@ class ODBCBridge:
                     })
 
                 conn.commit()
+                pool.invalidate_caches()
                 return {
                     "status": "ok",
                     "results": results
@@ -469,62 +992,61 @@ class ODBCBridge:
         if pool_id not in self._pools:
             return {"status": "error", "message": "Unknown pool"}
 
+        for stream_id, (stream_pool_id, _) in list(self._streams.items()):
+            if stream_pool_id == pool_id:
+                self.close_stream(stream_id)
+
         with self._lock:
-            if pool_id in self._pools:
-                pool = self._pools[pool_id]
-                with pool._lock:
-                    for conn in pool._pool:
-                        try:
-                            conn.close()
-                        except:
-                            pass
-                    pool._pool.clear()
-                    pool._active = 0
-                del self._pools[pool_id]
+            pool = self._pools.get(pool_id)
+            if pool is not None:
+                pools = dict(self._pools)
+                del pools[pool_id]
+                self._pools = MappingProxyType(pools)
+
+        if pool is not None:
+            pool.close_all()
 
         return {"status": "ok"}
 
     def tables(self, pool_id: str, schema: Optional[str] = None) -> Dict:
-        """Get list of tables."""
-        if pool_id not in self._pools:
+        """Get list of tables via the driver's SQLTables catalog function."""
+        pool = self._pools.get(pool_id)
+        if pool is None:
             return {"status": "error", "message": "Unknown pool"}
-
-        pool = self._pools[pool_id]
+        cache_key = ResultCache.make_key("tables", [schema])
+        generation = pool.metadata.generation
+        if pool.metadata.enabled:
+            cached = pool.metadata.get(cache_key)
+            if cached is not None:
+                return cached
 
         try:
             with pool.get_connection() as conn:
-                cursor = conn.cursor
-
-                if schema:
-                    query = """
-                    SELECT TABLE_NAME, TABLE_TYPE, TABLE_SCHEMA
-                    FROM INFORMATION_SCHEMA.TABLES
-                    WHERE TABLE_SCHEMA = ?
-                    ORDER BY TABLE_NAME
-                    """
-                    cursor.execute(query, [schema])
-                else:
-                    query = """
-                    SELECT TABLE_NAME, TABLE_TYPE, TABLE_SCHEMA
-                    FROM INFORMATION_SCHEMA.TABLES
-                    ORDER BY TABLE_NAME
-                    """
-                    cursor.execute(query)
-
-                rows = cursor.fetchall()
-                tables = [
-                    {
-                        "name": row[0],
-                        "type": row[1],
-                        "schema": row[2]
-                    }
-                    for row in rows
-                ]
-
-                return {
+                raw = conn._conn.cursor()
+                try:
+                    rows = raw.tables(schema=schema).fetchall()
+                finally:
+                    raw.close()
+
+                tables = sorted(
+                    (
+                        {
+                            "name": row.table_name,
+                            "type": row.table_type,
+                            "schema": row.table_schem
+                        }
+                        for row in rows
+                    ),
+                    key=lambda t: t["name"]
+                )
+
+                result = {
                     "status": "ok",
                     "tables": tables
                 }
+                if pool.metadata.enabled:
+                    pool.metadata.set(cache_key, result, generation)
+                return result
 
         except Exception as e:
             logger.error(f"ODBC tables failed: {e}")
@@ -534,50 +1056,47 @@ class ODBCBridge:
             }
 
     def columns(self, pool_id: str, table_name: str, schema: Optional[str] = None) -> Dict:
-        """Get column information for a table."""
-        if pool_id not in self._pools:
+        """Get column information for a table via the SQLColumns catalog function."""
+        pool = self._pools.get(pool_id)
+        if pool is None:
             return {"status": "error", "message": "Unknown pool"}
-
-        pool = self._pools[pool_id]
+        cache_key = ResultCache.make_key("columns", [table_name, schema])
+        generation = pool.metadata.generation
+        if pool.metadata.enabled:
+            cached = pool.metadata.get(cache_key)
+            if cached is not None:
+                return cached
 
         try:
             with pool.get_connection() as conn:
-                cursor = conn.cursor
-
-                if schema:
-                    query = """
-                    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT, ORDINAL_POSITION
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = ? AND TABLE_SCHEMA = ?
-                    ORDER BY ORDINAL_POSITION
-                    """
-                    cursor.execute(query, [table_name, schema])
-                else:
-                    query = """
-                    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT, ORDINAL_POSITION
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = ?
-                    ORDER BY ORDINAL_POSITION
-                    """
-                    cursor.execute(query, [table_name])
-
-                rows = cursor.fetchall()
-                columns = [
-                    {
-                        "name": row[0],
-                        "type": row[1],
-                        "nullable": row[2] == "YES",
-                        "default": row[3],
-                        "ordinal": row[4]
-                    }
-                    for row in rows
-                ]
-
-                return {
+                raw = conn._conn.cursor()
+                try:
+                    rows = raw.columns(table=table_name, schema=schema).fetchall()
+                finally:
+                    raw.close()
+
+                columns = sorted(
+                    (
+                        {
+                            "name": row.column_name,
+                            "type": row.type_name,
+                            "nullable": row.is_nullable == "YES",
+                            "default": row.column_def,
+                            "ordinal": row.ordinal_position
+                        }
+                        for row in rows
+                    ),
+                    key=lambda c: c["ordinal"]
+                )
+
+                result = {
                     "status": "ok",
                     "table": table_name,
                     "columns": columns
                 }
+                if pool.metadata.enabled:
+                    pool.metadata.set(cache_key, result, generation)
+                return result
 
         except Exception as e:
             logger.error(f"ODBC columns failed: {e}")
@@ -588,11 +1107,10 @@ class ODBCBridge:
 
     def health(self, pool_id: str) -> Dict:
         """Check connection pool health."""
-        if pool_id not in self._pools:
+        pool = self._pools.get(pool_id)
+        if pool is None:
             return {"status": "error", "message": "Unknown pool"}
 
-        pool = self._pools[pool_id]
-
         return {
             "status": "ok",
             "pool_id": pool_id,
@@ -601,23 +1119,44 @@ class ODBCBridge:
             "max_size": pool.config.max_pool_size
         }
 
-    def execute_many(self, pool_id: str, sql: str, params_list: List[List[Any]]) -> Dict:
-        """Execute the same SQL with multiple parameter sets."""
-        if pool_id not in self._pools:
-            return {"status": "error", "message": "Unknown pool"}
+    def execute_many(
+        self,
+        pool_id: str,
+        sql: str,
+        params_list: List[List[Any]],
+        commit_every: Optional[int] = COMMIT_EVERY
+    ) -> Dict:
+        """
+        Execute the same SQL with multiple parameter sets.
 
-        pool = self._pools[pool_id]
+        The batch is committed every commit_every rows so a large load does
+        not hold locks for its whole duration; earlier chunks stay committed
+        if a later one fails. Pass None or 0 to commit once at the end.
+        """
+        pool = self._pools.get(pool_id)
+        if pool is None:
+            return {"status": "error", "message": "Unknown pool"}
+        chunk_size = commit_every if commit_every and commit_every > 0 else max(len(params_list), 1)
 
         try:
             with pool.get_connection() as conn:
                 cursor = conn.cursor
                 total_affected = 0
 
-                for params in params_list:
-                    cursor.execute(sql, params)
-                    total_affected += cursor.rowcount
-
-                conn.commit()
+                try:
+                    for chunk in _chunked(params_list, chunk_size):
+                        if pool.config.fast_executemany:
+                            cursor.executemany(sql, chunk)
+                            # pyodbc resets rowcount to -1 after executemany; every
+                            # parameter set ran, so count one row per set.
+                            total_affected += cursor.rowcount if cursor.rowcount >= 0 else len(chunk)
+                        else:
+                            for params in chunk:
+                                cursor.execute(sql, params)
+                                total_affected += cursor.rowcount
+                        conn.commit()
+                finally:
+                    pool.invalidate_caches()
 
                 return {
                     "status": "ok",
@@ -632,12 +1171,129 @@ class ODBCBridge:
                 "message": str(e)
             }
 
-    def ping(self, pool_id: str) -> Dict:
-        """Check if connection is alive."""
+    def stream_query(
+        self,
+        pool_id: str,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query and yield its rows in batches.
+
+        Only one batch is materialized at a time. The pooled connection is
+        held for the generator's lifetime and returned to the pool when the
+        generator is exhausted, closed or garbage collected.
+        """
+        pool = self._pools.get(pool_id)
+        if pool is None:
+            raise KeyError(f"Unknown pool: {pool_id}")
+
+        conn = pool.get_connection()
+        try:
+            cursor = conn.cursor
+            cursor.execute(sql, params or [])
+            columns = cursor.columns
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield {"columns": columns, "rows": rows}
+        finally:
+            conn.close()
+
+    def open_stream(
+        self,
+        pool_id: str,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 1000
+    ) -> Dict:
+        """Start a streamed query; batches are pulled with next_batch()."""
         if pool_id not in self._pools:
             return {"status": "error", "message": "Unknown pool"}
 
-        pool = self._pools[pool_id]
+        stream_id = f"stream_{uuid.uuid4().hex[:12]}"
+        self._streams[stream_id] = (pool_id, self.stream_query(pool_id, sql, params, batch_size))
+        return {"status": "ok", "stream_id": stream_id}
+
+    def next_batch(self, stream_id: str) -> Dict:
+        """Fetch the next batch of a streamed query."""
+        entry = self._streams.get(stream_id)
+        if entry is None:
+            return {"status": "error", "message": "Unknown stream"}
+
+        try:
+            batch = next(entry[1])
+        except StopIteration:
+            self._streams.pop(stream_id, None)
+            return {"status": "ok", "done": True, "columns": [], "rows": []}
+        except Exception as e:
+            self._streams.pop(stream_id, None)
+            logger.error(f"ODBC stream failed: {e}")
+            return {"status": "error", "message": str(e)}
+
+        return {"status": "ok", "done": False, **batch}
+
+    def close_stream(self, stream_id: str) -> Dict:
+        """Stop a streamed query early and release its connection."""
+        entry = self._streams.pop(stream_id, None)
+        if entry is not None:
+            entry[1].close()
+        return {"status": "ok"}
+
+    def fetch_arrow(self, pool_id: str, sql: str) -> Dict:
+        """
+        Execute a SELECT query through arrow-odbc with column-wise binding.
+
+        The driver fills contiguous Arrow buffers directly, so no per-cell
+        Python objects are created. The result table is returned serialized
+        as an Arrow IPC stream.
+        """
+        pool = self._pools.get(pool_id)
+        if pool is None:
+            return {"status": "error", "message": "Unknown pool"}
+
+        if not ARROW_ODBC_AVAILABLE:
+            return {
+                "status": "error",
+                "message": "arrow-odbc not installed. Run: pip install arrow-odbc pyarrow"
+            }
+
+        try:
+            reader = read_arrow_batches_from_odbc(
+                query=sql,
+                connection_string=pool.connection_string,
+                max_bytes_per_batch=ARROW_MAX_BYTES_PER_BATCH
+            )
+            table = pa.Table.from_batches(list(reader), schema=reader.schema)
+
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+
+            return {
+                "status": "ok",
+                "format": "arrow_ipc",
+                "columns": table.column_names,
+                "row_count": table.num_rows,
+                "data": sink.getvalue().to_pybytes()
+            }
+
+        except Exception as e:
+            logger.error(f"ODBC fetch_arrow failed: {e}")
+            return {
+                "status": "error",
+                "message": str(e),
+                "sql": sql[:200] if sql else ""
+            }
+
+    def ping(self, pool_id: str) -> Dict:
+        """Check if connection is alive."""
+        pool = self._pools.get(pool_id)
+        if pool is None:
+            return {"status": "error", "message": "Unknown pool"}
 
         try:
             with pool.get_connection() as conn:
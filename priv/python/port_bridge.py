@@ -10,6 +10,7 @@ import importlib
 import traceback
 import base64
 import struct
+from collections.abc import Mapping
 
 # Optional imports - handle gracefully if not available
 try:
@@ -53,7 +54,7 @@ def python_to_wire(obj):
         return {"__bytes__": base64.b64encode(obj).decode('ascii')}
     elif isinstance(obj, (list, tuple)):
         return [python_to_wire(x) for x in obj]
-    elif isinstance(obj, dict):
+    elif isinstance(obj, Mapping):
         return {str(k): python_to_wire(v) for k, v in obj.items()}
     elif NUMPY_AVAILABLE and isinstance(obj, np.ndarray):
         return {"__numpy_array__": encode_numpy_array(obj)}
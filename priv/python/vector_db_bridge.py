@@ -12,13 +12,40 @@ Usage:
     results = bridge.search(query_embedding, top_k=5)
 """
 
+import os
+import sys
 import json
 import uuid
 import hashlib
 import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from typing import Optional, Dict, List, Any, Union
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+try:
+    import numpy as np
+    from _simd_kernels import cosine_vector_to_matrix, dot_vector_to_matrix
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 try:
     import chromadb
@@ -50,20 +77,29 @@ except ImportError:
 
 try:
     import pymilvus
-    from pymilvus import connections, collection
+    from pymilvus import connections, utility, Collection, CollectionSchema, FieldSchema, DataType
     MILVUS_AVAILABLE = True
 except ImportError:
     MILVUS_AVAILABLE = False
 
 try:
     import psycopg2
-    from pgvector.psycopg2 import Vector
+    from psycopg2.extras import execute_values
+    from psycopg2.pool import ThreadedConnectionPool
+    from pgvector.psycopg2 import Vector, register_vector
     PGVECTOR_AVAILABLE = True
 except ImportError:
     PGVECTOR_AVAILABLE = False
 
 try:
     import redis
+    from redis.exceptions import ResponseError as RedisResponseError
+    from redis.commands.search.field import TagField, VectorField
+    from redis.commands.search.query import Query as RedisQuery
+    try:
+        from redis.commands.search.index_definition import IndexDefinition, IndexType
+    except ImportError:
+        from redis.commands.search.indexDefinition import IndexDefinition, IndexType
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
@@ -71,15 +107,69 @@ except ImportError:
 try:
     import azure.search.documents
     from azure.core.credentials import AzureKeyCredential
+    from azure.search.documents.models import VectorQuery
     AZURE_SEARCH_AVAILABLE = True
 except ImportError:
     AZURE_SEARCH_AVAILABLE = False
 
 from vector_db_pool import (
-    ConnectionPool, QueryCache, CircuitBreaker,
+    ConnectionPool, QueryCache, CircuitBreaker, DecorrelatedJitter,
     get_pool, get_cache, get_breaker, health_check_all
 )
 
+logger = logging.getLogger(__name__)
+
+# Shared read-only metadata for documents stored without any, instead of a fresh {} each.
+_EMPTY_META = MappingProxyType({})
+
+# pgvector distance operator, index operator class and a higher-is-better
+# score expression over the distance, per metric.
+PGVECTOR_METRICS = {
+    "cosine": ("<=>", "vector_cosine_ops", "1 - ({dist})"),
+    "dot": ("<#>", "vector_ip_ops", "-({dist})"),
+    "euclidean": ("<->", "vector_l2_ops", "-({dist})"),
+}
+
+# Pinecone's maximum number of vectors per upsert request.
+PINECONE_UPSERT_BATCH = 100
+
+# Azure AI Search accepts at most 1000 documents per indexing request.
+AZURE_UPLOAD_BATCH = 1000
+
+# Smallest shard worth a thread when adding one document per request.
+MIN_ADD_SHARD = 16
+
+# Retry policy for every remote call the bridge makes; override per bridge with retry_policy.
+DEFAULT_RETRY_POLICY = DecorrelatedJitter(base=0.05, cap=2.0, max_attempts=3)
+
+# Shared by every bridge for fanning batch adds out to network-bound backends.
+# Each bridge caps its own share with the concurrency option.
+_BRIDGE_EXEC = ThreadPoolExecutor(max_workers=16, thread_name_prefix="vector-db")
+
+# Storage types for the memory backend's matrix; narrower types trade a little recall for memory.
+MEMORY_DTYPES = ("float32", "float16", "int8")
+
+# Rows upcast to float32 at a time when searching a float16 or int8 memory matrix.
+MEMORY_SEARCH_BLOCK = 4096
+
+# RediSearch DISTANCE_METRIC per metric. COSINE and IP report 1 - similarity.
+REDIS_METRICS = {
+    "cosine": "COSINE",
+    "dot": "IP",
+    "euclidean": "L2",
+}
+
+# Layout version of Redis document hashes, recorded per collection once
+# older documents have been backfilled; see _backfill_redis_docs.
+REDIS_SCHEMA_VERSION = 2
+
+# Documents read and rewritten per pipeline while backfilling.
+REDIS_BACKFILL_BATCH = 1000
+
+# FT.SEARCH errors meaning the server cannot run KNN queries for this
+# collection at all (module not loaded, index gone), as opposed to a bad query.
+REDIS_KNN_UNAVAILABLE_ERRORS = ("unknown command", "unknown index", "no such index")
+
 
 class Backend(Enum):
     MEMORY = "memory"
@@ -93,13 +183,186 @@ class Backend(Enum):
     AZURE = "azure"
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10; older interpreters fall back to a regular __dict__.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class SearchResult:
     id: str
     score: float
     embedding: Optional[List[float]] = None
     metadata: Optional[Dict[str, Any]] = None
 
+    def __hash__(self):
+        # embedding and metadata are unhashable; a hit is identified by id and score.
+        return hash((self.id, self.score))
+
+
+class _NoopBreaker:
+    """Stand-in circuit breaker for backends with no remote dependency."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def run(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": "disabled"}
+
+
+class _NoopPool:
+    """Stand-in pool that runs operations directly, without retries or a semaphore."""
+
+    def execute_with_retry(self, operation, *args, attempt_policy=None, **kwargs):
+        return operation(*args, **kwargs)
+
+    def health_check(self) -> Dict[str, Any]:
+        return {"healthy": True}
+
+
+if PGVECTOR_AVAILABLE:
+
+    class _PgVectorPool(ThreadedConnectionPool):
+        """Threaded psycopg2 pool that registers the vector type on each new connection."""
+
+        def _connect(self, key=None):
+            conn = super()._connect(key)
+            register_vector(conn)
+            return conn
+
+
+@dataclass
+class _QueryVec:
+    """
+    A search query converted once, in the forms the backends consume.
+
+    Only values is set when NumPy is unavailable.
+    """
+    values: List[float]
+    arr: Optional["np.ndarray"] = None
+    norm: float = 0.0
+    arr_norm: Optional["np.ndarray"] = None
+    bytes: Optional[bytes] = None
+
+
+def _top_k_indices(scores: "np.ndarray", top_k: int, ids: Optional[List[str]] = None) -> List[int]:
+    """
+    Indices of the top_k highest scores, best first.
+
+    Partitions in O(N) to find the kth score, then sorts only the rows
+    scoring at least that much, so rows tied at the cutoff all compete.
+    Equal scores are ordered by ids when given (row order can change after
+    deletes), otherwise by index.
+    """
+    n = scores.shape[0]
+    k = min(top_k, n)
+    if k <= 0:
+        return []
+    if k < n:
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        idx = np.flatnonzero(scores >= kth)
+    else:
+        idx = np.arange(n)
+    idx = idx[np.argsort(-scores[idx], kind="stable")].tolist()
+    if ids is not None:
+        idx.sort(key=lambda i: (-scores[i], ids[i]))
+    return idx[:k]
+
+
+class SemanticQueryCache:
+    """
+    Search result cache keyed by query similarity rather than exact equality.
+
+    Keeps the most recent max_size normalized query embeddings in a ring
+    buffer. A lookup returns the results of the most similar cached query
+    with the same top_k and filter, provided its cosine similarity is at
+    least threshold and the entry is younger than ttl_seconds. The owning
+    bridge clears it on every write; clear() bumps generation so a search
+    that raced the write does not re-cache stale results.
+    """
+
+    def __init__(self, threshold: float = 0.97, max_size: int = 256, ttl_seconds: float = 300.0):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._queries = None
+        self._entries: List[Optional[tuple]] = [None] * max_size
+        self._next = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self.generation = 0
+
+    @staticmethod
+    def _filter_key(filter: Optional[Dict[str, Any]]) -> Optional[str]:
+        return json.dumps(filter, sort_keys=True) if filter else None
+
+    def get(self, query: "np.ndarray", top_k: int, filter: Optional[Dict[str, Any]]) -> Optional[List[SearchResult]]:
+        """Get cached results for a normalized query, or None."""
+        filter_key = self._filter_key(filter)
+        now = time.monotonic()
+        with self._lock:
+            if self._queries is not None and self._queries.shape[1] == query.shape[0]:
+                sims = self._queries @ query
+                candidates = np.flatnonzero(sims >= self.threshold)
+                for i in candidates[np.argsort(-sims[candidates])].tolist():
+                    entry = self._entries[i]
+                    if entry and entry[0] == top_k and entry[1] == filter_key and now - entry[2] <= self.ttl_seconds:
+                        self._hits += 1
+                        return entry[3]
+            self._misses += 1
+            return None
+
+    def set(
+        self,
+        query: "np.ndarray",
+        top_k: int,
+        filter: Optional[Dict[str, Any]],
+        results: List[SearchResult],
+        generation: Optional[int] = None
+    ):
+        """
+        Cache results for a normalized query, replacing the oldest entry when full.
+
+        Results are dropped if the cache was cleared since generation was read.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if self._queries is None or self._queries.shape[1] != query.shape[0]:
+                self._queries = np.zeros((self.max_size, query.shape[0]), dtype=np.float32)
+                self._entries = [None] * self.max_size
+                self._next = 0
+            slot = self._next
+            self._queries[slot] = query
+            self._entries[slot] = (top_k, self._filter_key(filter), time.monotonic(), results)
+            self._next = (slot + 1) % self.max_size
+
+    def clear(self):
+        """Clear the cache."""
+        with self._lock:
+            self._queries = None
+            self._entries = [None] * self.max_size
+            self._next = 0
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total = self._hits + self._misses
+        return {
+            "size": sum(1 for entry in self._entries if entry),
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total > 0 else 0.0
+        }
+
 
 class VectorDBBridge:
     """
@@ -107,10 +370,18 @@ class VectorDBBridge:
     
     Features:
     - Connection pooling
-    - Retry with exponential backoff
+    - Retry with decorrelated-jitter backoff
     - Circuit breaker
     - Query caching
     - Metrics tracking
+
+    Pass normalized=True when all embeddings and queries are already
+    unit-length (e.g. OpenAI or SBERT output); cosine similarity is then
+    computed as a plain dot product without norm divisions.
+
+    semantic_cache_threshold enables a second cache level that also serves
+    results for queries whose embedding is at least that cosine-similar to
+    a recently answered one (e.g. 0.97 for rephrased prompts).
     """
 
     def __init__(
@@ -123,6 +394,8 @@ class VectorDBBridge:
         metric: str = "cosine",
         enable_cache: bool = True,
         cache_ttl: float = 300.0,
+        normalized: bool = False,
+        semantic_cache_threshold: Optional[float] = None,
         **kwargs
     ):
         self.backend_name = backend.lower()
@@ -131,42 +404,187 @@ class VectorDBBridge:
         self.api_key = api_key
         self.dimensions = dimensions
         self.metric = metric
+        self.normalized = normalized
         self._client = None
         self._collection = None
         
-        self._pool = get_pool(backend)
+        # The in-memory backend cannot fail transiently, so it skips the
+        # shared pool and circuit breaker.
+        in_memory = self.backend_name == "memory"
+        self._pool = _NoopPool() if in_memory else get_pool(backend)
         self._cache = get_cache(backend) if enable_cache else None
-        self._breaker = get_breaker(backend)
+        # The query cache is shared per backend; results are scoped to the
+        # collection, and each memory bridge is its own store.
+        self._cache_namespace = object() if in_memory else (host, collection)
+        self._semantic_cache = (
+            SemanticQueryCache(semantic_cache_threshold, ttl_seconds=cache_ttl)
+            if enable_cache and semantic_cache_threshold and NUMPY_AVAILABLE else None
+        )
+        self._breaker = _NoopBreaker() if in_memory else get_breaker(backend)
+        self._add_concurrency = max(1, kwargs.get("concurrency", 8))
+        self._retry_policy = kwargs.get("retry_policy") or DEFAULT_RETRY_POLICY
         
         self._init_backend(**kwargs)
 
+        self._bind_backend()
+
     def _init_backend(self, **kwargs):
         """Initialize the appropriate backend."""
+        init = {
+            "memory": self._init_memory_backend,
+            "chroma": self._init_chroma_backend,
+            "pinecone": self._init_pinecone_backend,
+            "weaviate": self._init_weaviate_backend,
+            "qdrant": self._init_qdrant_backend,
+            "milvus": self._init_milvus_backend,
+            "pgvector": self._init_pgvector_backend,
+            "redis": self._init_redis_backend,
+            "azure": self._init_azure_backend,
+        }.get(self.backend_name)
+        if init is None:
+            raise ValueError(f"Unknown backend: {self.backend_name}")
+        init(**kwargs)
+
+    def _bind_backend(self):
+        """
+        Resolve the backend's operations once, so public methods call them
+        directly instead of branching on the backend name per call. Operations
+        a backend does not support fall back to an empty result.
+        """
+        name = self.backend_name
+        self._add_fn = {
+            "memory": self._add_memory,
+            "chroma": self._add_chroma,
+            "pinecone": self._add_pinecone,
+            "weaviate": self._add_weaviate,
+            "qdrant": self._add_qdrant,
+            "milvus": self._add_milvus,
+            "pgvector": self._add_pgvector,
+            "redis": self._add_redis,
+            "azure": self._add_azure,
+        }[name]
+        self._search_fn = {
+            "memory": self._search_memory,
+            "chroma": self._search_chroma,
+            "pinecone": self._search_pinecone,
+            "weaviate": self._search_weaviate,
+            "qdrant": self._search_qdrant,
+            "milvus": self._search_milvus,
+            "pgvector": self._search_pgvector,
+            "redis": self._search_redis,
+            "azure": self._search_azure,
+        }[name]
+        self._get_fn = {
+            "memory": self._get_memory,
+            "chroma": self._get_chroma,
+            "pinecone": self._get_pinecone,
+            "weaviate": self._get_weaviate,
+            "qdrant": self._get_qdrant,
+            "pgvector": self._get_pgvector,
+            "redis": self._get_redis,
+            "azure": self._get_azure,
+        }.get(name, lambda doc_id: None)
+        self._delete_fn = {
+            "memory": self._delete_memory,
+            "chroma": self._delete_chroma,
+            "pinecone": self._delete_pinecone,
+            "weaviate": self._delete_weaviate,
+            "qdrant": self._delete_qdrant,
+            "pgvector": self._delete_pgvector,
+            "redis": self._delete_redis,
+            "azure": self._delete_azure,
+        }.get(name, lambda doc_id: False)
+        self._update_metadata_fn = {
+            "memory": self._update_metadata_memory,
+            "chroma": self._update_metadata_chroma,
+            "pinecone": self._update_metadata_pinecone,
+            "weaviate": self._update_metadata_weaviate,
+            "qdrant": self._update_metadata_qdrant,
+            "pgvector": self._update_metadata_pgvector,
+            "redis": self._update_metadata_redis,
+            "azure": self._update_metadata_azure,
+        }.get(name, lambda doc_id, metadata: False)
+        self._count_fn = {
+            "memory": self._count_memory,
+            "chroma": self._count_chroma,
+            "pinecone": self._count_pinecone,
+            "qdrant": self._count_qdrant,
+            "pgvector": self._count_pgvector,
+            "redis": self._count_redis,
+            "azure": self._count_azure,
+        }.get(name, lambda: 0)
+
+    def _init_memory_backend(self, **kwargs):
+        """
+        In-memory fallback backed by a NumPy matrix.
+
+        Embeddings are stored L2-normalized as rows of one contiguous
+        (capacity, D) matrix, with ids, metadata and original norms kept in
+        parallel, so a search is a single matrix-vector product. D is taken
+        from the first added embedding.
+
+        embedding_dtype selects the matrix type: float32 (default), float16,
+        or int8 with a per-row scale. The narrower types cut memory by 2x/4x
+        at the cost of a few percent of recall; scores are computed in float32.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy not installed. Run: pip install numpy")
+
+        embedding_dtype = kwargs.get("embedding_dtype") or "float32"
+        if embedding_dtype not in MEMORY_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding_dtype: {embedding_dtype}. Use one of {', '.join(MEMORY_DTYPES)}"
+            )
+        self._mem_dtype = np.dtype(embedding_dtype)
+        self._mem_embeddings = np.empty((0, self.dimensions), dtype=self._mem_dtype)
+        self._mem_norms = np.empty((0,), dtype=np.float32)
+        self._mem_scales = np.empty((0,), dtype=np.float32)
+        self._mem_ids: List[str] = []
+        self._mem_meta: List[Dict[str, Any]] = []
+        self._mem_id_index: Dict[str, int] = {}
+
+    def _mem_reserve(self, size: int, dim: int):
+        """Grow the memory backend's matrix to hold at least size rows, doubling capacity."""
+        if not self._mem_ids and self._mem_embeddings.shape[1] != dim:
+            # Empty store: adopt the new dimension, dropping the old capacity everywhere.
+            self._mem_embeddings = np.empty((0, dim), dtype=self._mem_dtype)
+            self._mem_norms = np.empty((0,), dtype=np.float32)
+            self._mem_scales = np.empty((0,), dtype=np.float32)
+        elif self._mem_embeddings.shape[1] != dim:
+            raise ValueError(
+                f"Embedding has {dim} dimensions, expected {self._mem_embeddings.shape[1]}"
+            )
 
-        if self.backend_name == "memory":
-            self._init_memory_backend()
-        elif self.backend_name == "chroma":
-            self._init_chroma_backend(**kwargs)
-        elif self.backend_name == "pinecone":
-            self._init_pinecone_backend(**kwargs)
-        elif self.backend_name == "weaviate":
-            self._init_weaviate_backend(**kwargs)
-        elif self.backend_name == "qdrant":
-            self._init_qdrant_backend(**kwargs)
-        elif self.backend_name == "milvus":
-            self._init_milvus_backend(**kwargs)
-        elif self.backend_name == "pgvector":
-            self._init_pgvector_backend(**kwargs)
-        elif self.backend_name == "redis":
-            self._init_redis_backend(**kwargs)
-        elif self.backend_name == "azure":
-            self._init_azure_backend(**kwargs)
+        capacity = self._mem_embeddings.shape[0]
+        if size <= capacity:
+            return
+
+        new_capacity = max(size, capacity * 2, 64)
+        embeddings = np.empty((new_capacity, dim), dtype=self._mem_dtype)
+        embeddings[:capacity] = self._mem_embeddings
+        norms = np.empty((new_capacity,), dtype=np.float32)
+        norms[:capacity] = self._mem_norms
+        scales = np.ones((new_capacity,), dtype=np.float32)
+        scales[:capacity] = self._mem_scales
+        self._mem_embeddings = embeddings
+        self._mem_norms = norms
+        self._mem_scales = scales
+
+    def _mem_write(self, start: int, unit: "np.ndarray"):
+        """Store unit-length float32 rows from start, quantizing them to the matrix dtype."""
+        end = start + unit.shape[0]
+        if self._mem_dtype == np.int8:
+            peak = np.abs(unit).max(axis=1)
+            scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+            self._mem_embeddings[start:end] = np.rint(unit / scales[:, None])
+            self._mem_scales[start:end] = scales
         else:
-            raise ValueError(f"Unknown backend: {self.backend_name}")
+            self._mem_embeddings[start:end] = unit
 
-    def _init_memory_backend(self):
-        """In-memory fallback using pure Python."""
-        self._memory_store = {}
+    def _mem_embedding(self, row: int) -> List[float]:
+        """Reconstruct the stored (un-normalized) embedding of a memory row."""
+        scale = self._mem_scales[row] * self._mem_norms[row]
+        return (self._mem_embeddings[row].astype(np.float32) * scale).tolist()
 
     def _init_chroma_backend(self, persist_directory: str = "./chroma_data", **kwargs):
         """Initialize ChromaDB."""
@@ -246,13 +664,16 @@ class VectorDBBridge:
             "dot": Distance.DOT
         }
 
-        self._client.recreate_collection(
-            collection_name=self.collection,
-            vectors_config=VectorParams(
-                size=self.dimensions,
-                distance=distance_map.get(self.metric, Distance.COSINE)
+        # Reuse an existing collection; recreating it would drop its points and HNSW index.
+        existing = {c.name for c in self._client.get_collections().collections}
+        if self.collection not in existing:
+            self._client.create_collection(
+                collection_name=self.collection,
+                vectors_config=VectorParams(
+                    size=self.dimensions,
+                    distance=distance_map.get(self.metric, Distance.COSINE)
+                )
             )
-        )
 
     def _init_milvus_backend(self, **kwargs):
         """Initialize Milvus."""
@@ -261,23 +682,32 @@ class VectorDBBridge:
 
         connections.connect(host=self.host or "localhost", port="19530")
 
-        schema = {
-            "fields": [
-                {"name": "id", "type": "INT64", "is_primary": True},
-                {"name": "embedding", "type": "FLOAT_VECTOR", "params": {"dim": self.dimensions}},
-                {"name": "metadata", "type": "STRING"}
-            ]
-        }
+        self._milvus_metric = {
+            "cosine": "COSINE",
+            "euclidean": "L2",
+            "dot": "IP"
+        }.get(self.metric, "COSINE")
 
-        self._collection = f"Collection_{self.collection}"
+        if utility.has_collection(self.collection):
+            self._collection = Collection(self.collection)
+        else:
+            schema = CollectionSchema([
+                FieldSchema("id", DataType.VARCHAR, is_primary=True, max_length=512),
+                FieldSchema("embedding", DataType.FLOAT_VECTOR, dim=self.dimensions),
+                FieldSchema("metadata", DataType.VARCHAR, max_length=65535)
+            ])
+            self._collection = Collection(self.collection, schema=schema)
+            self._collection.create_index(
+                "embedding",
+                {"index_type": "HNSW", "metric_type": self._milvus_metric, "params": {"M": 16, "efConstruction": 64}}
+            )
+        self._collection.load()
 
     def _init_pgvector_backend(self, **kwargs):
         """Initialize pgvector (PostgreSQL vector extension)."""
         if not PGVECTOR_AVAILABLE:
             raise ImportError("pgvector not installed. Run: pip install pgvector")
 
-        import os
-
         self._conn_params = {
             "host": kwargs.get("host", os.environ.get("PGHOST", "localhost")),
             "port": kwargs.get("port", os.environ.get("PGPORT", "5432")),
@@ -287,21 +717,71 @@ class VectorDBBridge:
         }
 
         self._table_name = kwargs.get("table", f"vector_{self.collection}")
-        self._connection = None
+        self._pg_operator, self._pg_opclass, self._pg_score = PGVECTOR_METRICS.get(
+            self.metric, PGVECTOR_METRICS["cosine"]
+        )
+        self._pg_create_index = kwargs.get("create_index", True)
+        self._pg_pool_size = kwargs.get("pool_size", 16)
+        self._pg_pool = None
+        self._pg_pool_lock = threading.Lock()
+
+    @contextmanager
+    def _pgvector_connection(self):
+        """
+        Borrow a connection from the PostgreSQL pool for the duration of the block.
+
+        The pool is created on first use. A block that raises rolls its
+        connection back before returning it to the pool; a connection that
+        has been closed (e.g. the server went away) is discarded instead, and
+        the block's original error is re-raised.
+        """
+        if self._pg_pool is None:
+            with self._pg_pool_lock:
+                if self._pg_pool is None:
+                    pool = _PgVectorPool(
+                        min(2, self._pg_pool_size), self._pg_pool_size, **self._conn_params
+                    )
+                    if self._pg_create_index:
+                        conn = pool.getconn()
+                        try:
+                            self._ensure_pgvector_index(conn)
+                        finally:
+                            pool.putconn(conn, close=bool(conn.closed))
+                    self._pg_pool = pool
+
+        conn = self._pg_pool.getconn()
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            raise
+        finally:
+            self._pg_pool.putconn(conn, close=bool(conn.closed))
 
-    def _get_pgvector_connection(self):
-        """Get or create PostgreSQL connection."""
-        if self._connection is None:
-            import psycopg2
-            self._connection = psycopg2.connect(**self._conn_params)
-        return self._connection
+    def _ensure_pgvector_index(self, conn):
+        """Create an HNSW index for the configured metric so ORDER BY uses ANN search."""
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self._table_name}_embedding_idx "
+                    f"ON {self._table_name} USING hnsw (embedding {self._pg_opclass})"
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Could not create pgvector index on {self._table_name}: {e}")
 
     def _init_redis_backend(self, **kwargs):
         """Initialize Redis with vector search."""
         if not REDIS_AVAILABLE:
             raise ImportError("redis not installed. Run: pip install redis")
-
-        import os
+        if not NUMPY_AVAILABLE:
+            # Vectors are stored and queried as raw float32 blobs.
+            raise ImportError("numpy not installed. Run: pip install numpy")
 
         self._redis_params = {
             "host": kwargs.get("host", os.environ.get("REDIS_HOST", "localhost")),
@@ -309,16 +789,101 @@ class VectorDBBridge:
             "db": kwargs.get("db", 0),
             "password": kwargs.get("password", os.environ.get("REDIS_PASSWORD", None))
         }
+        self._redis_pool = redis.ConnectionPool(
+            max_connections=kwargs.get("pool_size", 16), **self._redis_params
+        )
 
         self._index_name = f"idx:{self.collection}"
+        self._redis_metric = REDIS_METRICS.get(self.metric, "COSINE")
+        self._redis_knn = False
         self._redis_client = None
 
     def _get_redis_client(self):
-        """Get or create Redis client."""
+        """Get or create the Redis client, which shares the bridge's connection pool across threads."""
         if self._redis_client is None:
-            self._redis_client = redis.Redis(**self._redis_params)
+            client = redis.Redis(connection_pool=self._redis_pool)
+            self._redis_knn = self._ensure_redis_index(client)
+            if self._redis_knn:
+                self._backfill_redis_docs(client)
+            self._redis_client = client
         return self._redis_client
 
+    def _ensure_redis_index(self, client) -> bool:
+        """
+        Create the collection's RediSearch HNSW index if missing.
+
+        Returns False when the server has no RediSearch module, in which case
+        searches fall back to brute-force scoring.
+        """
+        index = client.ft(self._index_name)
+        try:
+            index.info()
+            return True
+        except RedisResponseError:
+            pass
+
+        try:
+            index.create_index(
+                [
+                    TagField("collection"),
+                    VectorField("vector", "HNSW", {
+                        "TYPE": "FLOAT32",
+                        "DIM": self.dimensions,
+                        "DISTANCE_METRIC": self._redis_metric
+                    })
+                ],
+                definition=IndexDefinition(prefix=["doc:"], index_type=IndexType.HASH)
+            )
+            return True
+        except RedisResponseError as e:
+            logger.warning(f"RediSearch unavailable for {self._index_name}, using brute-force search: {e}")
+            return False
+
+    def _backfill_redis_docs(self, client):
+        """
+        Give documents written before the KNN index the fields it indexes.
+
+        Older versions stored the embedding only as a JSON "embedding" field
+        and no "collection" tag, so RediSearch cannot see them and KNN
+        searches would silently skip them. Each such hash gets its raw float32
+        "vector" and the tag once; a schema marker per collection lets later
+        connections skip the scan.
+        """
+        marker = f"{self._index_name}:schema"
+        if client.get(marker) == str(REDIS_SCHEMA_VERSION).encode():
+            return
+
+        ids = [
+            doc_id.decode() if isinstance(doc_id, bytes) else doc_id
+            for doc_id in client.smembers(f"{self._index_name}:ids")
+        ]
+        migrated = 0
+        for start in range(0, len(ids), REDIS_BACKFILL_BATCH):
+            batch = ids[start:start + REDIS_BACKFILL_BATCH]
+            pipe = client.pipeline(transaction=False)
+            for doc_id in batch:
+                pipe.hmget(f"doc:{doc_id}", "vector", "collection", "embedding")
+            rows = pipe.execute()
+
+            pipe = client.pipeline(transaction=False)
+            for doc_id, (vector, collection, embedding) in zip(batch, rows):
+                if vector is None and embedding is None:
+                    continue  # Listed in the id set but already deleted.
+                if vector is not None and collection is not None:
+                    continue
+                key = f"doc:{doc_id}"
+                fields = {"collection": self.collection}
+                if vector is None:
+                    fields["vector"] = np.asarray(_loads(embedding), dtype=np.float32).tobytes()
+                pipe.hset(key, mapping=fields)
+                pipe.hdel(key, "embedding")
+                migrated += 1
+            pipe.execute()
+
+        if migrated:
+            logger.info(f"Backfilled {migrated} Redis documents into {self._index_name}")
+        client.set(marker, REDIS_SCHEMA_VERSION)
+
     def _init_azure_backend(self, **kwargs):
         """Initialize Azure AI Search."""
         if not AZURE_SEARCH_AVAILABLE:
@@ -337,14 +902,11 @@ class VectorDBBridge:
             credential=AzureKeyCredential(self._search_key)
         )
 
-    def _with_circuit_breaker(self, operation):
-        """Execute operation with circuit breaker protection."""
-        with self._breaker:
-            return operation()
-
-    def _with_retry(self, operation):
+    def _with_retry(self, operation, *args, **kwargs):
         """Execute operation with retry logic."""
-        return self._pool.execute_with_retry(operation)
+        return self._pool.execute_with_retry(
+            operation, *args, attempt_policy=self._retry_policy, **kwargs
+        )
 
     def add(
         self,
@@ -353,29 +915,47 @@ class VectorDBBridge:
         metadata: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Add a single document to the database."""
-        return self._with_circuit_breaker(
-            lambda: self._add_impl(doc_id, embedding, metadata)
-        )
+        try:
+            return self._breaker.run(self._with_retry, self._add_fn, doc_id, embedding, metadata)
+        finally:
+            self._invalidate_caches()
 
-    def _add_impl(self, doc_id, embedding, metadata):
-        """Internal add implementation with retry."""
-        def operation():
-            if self.backend_name == "memory":
-                return self._add_memory(doc_id, embedding, metadata)
-            elif self.backend_name == "chroma":
-                return self._add_chroma(doc_id, embedding, metadata)
-            elif self.backend_name == "pinecone":
-                return self._add_pinecone(doc_id, embedding, metadata)
-            elif self.backend_name == "weaviate":
-                return self._add_weaviate(doc_id, embedding, metadata)
-            elif self.backend_name == "qdrant":
-                return self._add_qdrant(doc_id, embedding, metadata)
+    def _add_memory(self, doc_id, embedding, metadata):
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = 1.0 if self.normalized else float(np.linalg.norm(vec))
+
+        row = self._mem_id_index.get(doc_id)
+        if row is None:
+            row = len(self._mem_ids)
+            self._mem_reserve(row + 1, vec.shape[0])
+            self._mem_ids.append(doc_id)
+            self._mem_meta.append(metadata or _EMPTY_META)
+            self._mem_id_index[doc_id] = row
+        else:
+            self._mem_reserve(row + 1, vec.shape[0])
+            self._mem_meta[row] = metadata or _EMPTY_META
+
+        self._mem_write(row, (vec / norm if norm and norm != 1.0 else vec)[None, :])
+        self._mem_norms[row] = norm
+        return True
+
+    def _delete_memory(self, doc_id) -> bool:
+        """Remove a row by moving the last row into its slot."""
+        row = self._mem_id_index.pop(doc_id, None)
+        if row is None:
             return False
-        
-        return self._with_retry(operation)
 
-    def _add_memory(self, doc_id, embedding, metadata):
-        self._memory_store[doc_id] = (embedding, metadata or {})
+        last = len(self._mem_ids) - 1
+        if row != last:
+            moved_id = self._mem_ids[last]
+            self._mem_embeddings[row] = self._mem_embeddings[last]
+            self._mem_norms[row] = self._mem_norms[last]
+            self._mem_scales[row] = self._mem_scales[last]
+            self._mem_ids[row] = moved_id
+            self._mem_meta[row] = self._mem_meta[last]
+            self._mem_id_index[moved_id] = row
+        self._mem_ids.pop()
+        self._mem_meta.pop()
         return True
 
     def _add_chroma(self, doc_id, embedding, metadata):
@@ -417,41 +997,37 @@ class VectorDBBridge:
         return True
 
     def _add_milvus(self, doc_id, embedding, metadata):
-        import json
-        from pymilvus import CollectionSchema, FieldSchema, DataType
-
-        self._client.insert(
-            collection_name=self._collection,
-            records=[embedding],
-            ids=[doc_id],
-            payloads=[json.dumps(metadata or {})]
-        )
+        self._collection.upsert([[doc_id], [embedding], [_dumps(metadata or {}).decode()]])
         return True
 
     def _add_pgvector(self, doc_id, embedding, metadata):
-        import json
-        conn = self._get_pgvector_connection()
-        with conn.cursor() as cur:
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
             # Insert vector and metadata
             cur.execute(
-                f"INSERT INTO {self._table_name} (id, embedding, metadata) VALUES (%s, %s, %s) ON CONFLICT (id) DO UPDATE",
-                (doc_id, embedding, json.dumps(metadata or {}))
+                f"INSERT INTO {self._table_name} (id, embedding, metadata) VALUES (%s, %s::vector, %s) "
+                "ON CONFLICT (id) DO UPDATE SET embedding = EXCLUDED.embedding, metadata = EXCLUDED.metadata",
+                (doc_id, np.asarray(embedding, dtype=np.float32), _dumps(metadata or {}).decode())
             )
             conn.commit()
         return True
 
     def _add_redis(self, doc_id, embedding, metadata):
-        import json
-        client = self._get_redis_client()
-        key = f"doc:{doc_id}"
-        client.hset(key, mapping={
-            "embedding": json.dumps(embedding),
-            "metadata": json.dumps(metadata or {}),
-            "vector": json.dumps(embedding)
-        })
-        # Add to index
-        client.sadd(f"{self._index_name}:ids", doc_id)
-        return True
+        return self._add_batch_redis([doc_id], [embedding], [metadata]) == 1
+
+    def _redis_fields(self, embedding, metadata) -> Dict[str, Any]:
+        """Hash fields stored for one Redis document; the embedding is kept once, as raw float32."""
+        return {
+            "collection": self.collection,
+            "metadata": _dumps(metadata or {}),
+            "vector": np.asarray(embedding, dtype=np.float32).tobytes()
+        }
+
+    @staticmethod
+    def _redis_embedding(data: Dict[bytes, bytes]) -> "np.ndarray":
+        """Decode a Redis document's embedding, including the JSON field written by older versions."""
+        if b"embedding" in data:
+            return np.asarray(_loads(data[b"embedding"]), dtype=np.float32)
+        return np.frombuffer(data.get(b"vector", b""), dtype=np.float32)
 
     def _add_azure(self, doc_id, embedding, metadata):
         document = {
@@ -469,29 +1045,169 @@ class VectorDBBridge:
         embeddings: Optional[List[List[float]]] = None
     ) -> int:
         """Add multiple documents efficiently."""
-        return self._with_circuit_breaker(
-            lambda: self._add_batch_impl(documents, embeddings)
-        )
+        try:
+            return self._breaker.run(self._add_batch_impl, documents, embeddings)
+        finally:
+            self._invalidate_caches()
 
     def _add_batch_impl(self, documents, embeddings):
-        def operation():
-            if not documents:
-                return 0
-            
-            if embeddings is None:
-                embeddings = [doc.get("embedding", []) for doc in documents]
-
-            ids = [doc.get("id", str(uuid.uuid4())) for doc in documents]
-            metadatas = [doc.get("metadata", {}) for doc in documents]
-
-            count = 0
-            for i, (doc_id, embedding, metadata) in enumerate(zip(ids, embeddings, metadatas)):
-                if self._add_impl(doc_id, embedding, metadata):
-                    count += 1
-
-            return count
-        
-        return self._with_retry(operation)
+        if not documents:
+            return 0
+
+        if embeddings is None:
+            embeddings = [doc.get("embedding", []) for doc in documents]
+
+        ids = [doc.get("id", str(uuid.uuid4())) for doc in documents]
+        metadatas = [doc.get("metadata", {}) for doc in documents]
+
+        if self.backend_name == "memory":
+            return self._add_batch_memory(ids, embeddings, metadatas)
+
+        add_batch = {
+            "chroma": self._add_batch_chroma,
+            "qdrant": self._add_batch_qdrant,
+            "milvus": self._add_batch_milvus,
+            "pgvector": self._add_batch_pgvector,
+            "redis": self._add_batch_redis,
+        }.get(self.backend_name)
+        if add_batch is not None:
+            return self._with_retry(add_batch, ids, embeddings, metadatas)
+
+        # The remaining backends need several requests per batch; spread them over threads.
+        add_batch, min_shard = {
+            "pinecone": (self._add_batch_pinecone, PINECONE_UPSERT_BATCH),
+            "azure": (self._add_batch_azure, AZURE_UPLOAD_BATCH),
+        }.get(self.backend_name, (self._add_each, MIN_ADD_SHARD))
+        return self._add_sharded(add_batch, ids, embeddings, metadatas, min_shard)
+
+    def _add_sharded(self, add_batch, ids, embeddings, metadatas, min_shard: int) -> int:
+        """
+        Split a batch into at most concurrency contiguous shards of at least
+        min_shard documents and add them in parallel, each with its own retry.
+        """
+        n = len(ids)
+        shards = min(self._add_concurrency, -(-n // min_shard))
+        if shards <= 1:
+            return self._with_retry(add_batch, ids, embeddings, metadatas)
+
+        size = -(-n // shards)
+        futures = [
+            _BRIDGE_EXEC.submit(
+                self._with_retry, add_batch,
+                ids[start:start + size], embeddings[start:start + size], metadatas[start:start + size]
+            )
+            for start in range(0, n, size)
+        ]
+        return sum(future.result() for future in as_completed(futures))
+
+    def _add_each(self, ids, embeddings, metadatas):
+        """Add documents one at a time, for backends without a batched write."""
+        count = 0
+        for doc_id, embedding, metadata in zip(ids, embeddings, metadatas):
+            if self._add_fn(doc_id, embedding, metadata):
+                count += 1
+        return count
+
+    def _add_batch_memory(self, ids, embeddings, metadatas):
+        """Append a batch to the memory matrix with one conversion and one reserve."""
+        if len(set(ids)) != len(ids) or any(doc_id in self._mem_id_index for doc_id in ids):
+            # Overwrites need per-row placement; keep the single-item path for them.
+            return sum(
+                1 for doc_id, embedding, metadata in zip(ids, embeddings, metadatas)
+                if self._add_memory(doc_id, embedding, metadata)
+            )
+
+        new = np.asarray(embeddings, dtype=np.float32)
+        if new.ndim != 2:
+            raise ValueError("Batch embeddings must all have the same number of dimensions")
+
+        start = len(self._mem_ids)
+        end = start + new.shape[0]
+        self._mem_reserve(end, new.shape[1])
+
+        if self.normalized:
+            norms = np.ones(new.shape[0], dtype=np.float32)
+        else:
+            norms = np.linalg.norm(new, axis=1)
+            np.divide(new, norms[:, None], out=new, where=norms[:, None] > 0)
+        self._mem_write(start, new)
+        self._mem_norms[start:end] = norms
+
+        self._mem_ids.extend(ids)
+        self._mem_meta.extend(metadata or _EMPTY_META for metadata in metadatas)
+        self._mem_id_index.update({doc_id: row for row, doc_id in enumerate(ids, start)})
+        return len(ids)
+
+    def _add_batch_chroma(self, ids, embeddings, metadatas):
+        self._collection.add(
+            ids=ids,
+            embeddings=embeddings,
+            metadatas=[metadata or {} for metadata in metadatas]
+        )
+        return len(ids)
+
+    def _add_batch_pinecone(self, ids, embeddings, metadatas):
+        vectors = [
+            {"id": doc_id, "values": embedding, "metadata": metadata or {}}
+            for doc_id, embedding, metadata in zip(ids, embeddings, metadatas)
+        ]
+        for start in range(0, len(vectors), PINECONE_UPSERT_BATCH):
+            self._client.upsert(vectors=vectors[start:start + PINECONE_UPSERT_BATCH])
+        return len(vectors)
+
+    def _add_batch_azure(self, ids, embeddings, metadatas):
+        documents = [
+            {**(metadata or {}), "id": doc_id, "embedding": embedding, "@search.action": "upload"}
+            for doc_id, embedding, metadata in zip(ids, embeddings, metadatas)
+        ]
+        for start in range(0, len(documents), AZURE_UPLOAD_BATCH):
+            self._search_client.upload_documents(documents=documents[start:start + AZURE_UPLOAD_BATCH])
+        return len(documents)
+
+    def _add_batch_milvus(self, ids, embeddings, metadatas):
+        self._collection.upsert([
+            list(ids),
+            list(embeddings),
+            [_dumps(metadata or {}).decode() for metadata in metadatas]
+        ])
+        return len(ids)
+
+    def _add_batch_qdrant(self, ids, embeddings, metadatas):
+        self._client.upsert(
+            collection_name=self.collection,
+            points=[
+                PointStruct(id=doc_id, vector=embedding, payload=metadata or {})
+                for doc_id, embedding, metadata in zip(ids, embeddings, metadatas)
+            ]
+        )
+        return len(ids)
+
+    def _add_batch_pgvector(self, ids, embeddings, metadatas):
+        rows = [
+            (doc_id, np.asarray(embedding, dtype=np.float32), _dumps(metadata or {}).decode())
+            for doc_id, embedding, metadata in zip(ids, embeddings, metadatas)
+        ]
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                f"INSERT INTO {self._table_name} (id, embedding, metadata) VALUES %s "
+                "ON CONFLICT (id) DO UPDATE SET embedding = EXCLUDED.embedding, metadata = EXCLUDED.metadata",
+                rows,
+                template="(%s, %s::vector, %s)"
+            )
+            conn.commit()
+        return len(rows)
+
+    def _add_batch_redis(self, ids, embeddings, metadatas):
+        pipe = self._get_redis_client().pipeline(transaction=False)
+        for doc_id, embedding, metadata in zip(ids, embeddings, metadatas):
+            key = f"doc:{doc_id}"
+            pipe.hset(key, mapping=self._redis_fields(embedding, metadata))
+            pipe.hdel(key, "embedding")
+        # Add to index
+        pipe.sadd(f"{self._index_name}:ids", *ids)
+        pipe.execute()
+        return len(ids)
 
     def search(
         self,
@@ -504,58 +1220,69 @@ class VectorDBBridge:
         """Search for similar documents."""
         
         # Try cache first
-        if use_cache and self._cache:
-            cached = self._cache.get(query_embedding, top_k, filter)
+        cache = self._cache if use_cache else None
+        if cache:
+            generation = cache.generation(self._cache_namespace)
+            cached = cache.get(query_embedding, top_k, filter, self._cache_namespace)
             if cached is not None:
                 return cached
 
-        def operation():
-            if self.backend_name == "memory":
-                results = self._search_memory(query_embedding, top_k)
-            elif self.backend_name == "chroma":
-                results = self._search_chroma(query_embedding, top_k, include_embeddings)
-            elif self.backend_name == "pinecone":
-                results = self._search_pinecone(query_embedding, top_k, filter)
-            elif self.backend_name == "weaviate":
-                results = self._search_weaviate(query_embedding, top_k, include_embeddings)
-            elif self.backend_name == "qdrant":
-                results = self._search_qdrant(query_embedding, top_k, include_embeddings)
-            else:
-                results = []
-
-            # Cache results
-            if use_cache and self._cache:
-                self._cache.set(query_embedding, top_k, filter, results)
-
-            return results
+        query = self._query_vec(query_embedding)
+
+        semantic_cache = self._semantic_cache if use_cache else None
+        if semantic_cache:
+            semantic_generation = semantic_cache.generation
+            cached = semantic_cache.get(query.arr_norm, top_k, filter)
+            if cached is not None:
+                return cached
 
         try:
-            return self._with_circuit_breaker(operation)
-        except Exception as e:
+            results = self._breaker.run(
+                self._with_retry, self._search_fn,
+                query, top_k, filter, include_embeddings
+            )
+        except Exception:
             # Invalidate cache on error
             if self._cache:
-                self._cache.invalidate(query_embedding, top_k, filter)
+                self._cache.invalidate(query_embedding, top_k, filter, self._cache_namespace)
             raise
 
-    def _search_memory(self, query: List[float], top_k: int) -> List[SearchResult]:
-        """Search in-memory store."""
-        all_items = list(self._memory_store.items())
-        scored = []
+        # Cache results
+        if cache:
+            cache.set(query_embedding, top_k, filter, results, self._cache_namespace, generation)
+        if semantic_cache:
+            semantic_cache.set(query.arr_norm, top_k, filter, results, semantic_generation)
+
+        return results
 
-        for doc_id, (embedding, metadata) in all_items.items():
-            score = self._cosine_similarity(query, embedding)
-            scored.append((doc_id, score, metadata))
+    def _search_memory(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
+        """Search in-memory store with one matrix-vector product over normalized rows."""
+        n = len(self._mem_ids)
+        if n == 0 or top_k <= 0:
+            return []
+
+        matrix = self._mem_embeddings[:n]
+        if self._mem_dtype == np.float32:
+            scores = matrix @ query.arr_norm
+        else:
+            # Upcast a block at a time so the narrow matrix is never copied whole.
+            scores = np.empty(n, dtype=np.float32)
+            for start in range(0, n, MEMORY_SEARCH_BLOCK):
+                block = matrix[start:start + MEMORY_SEARCH_BLOCK].astype(np.float32)
+                np.matmul(block, query.arr_norm, out=scores[start:start + block.shape[0]])
+            if self._mem_dtype == np.int8:
+                scores *= self._mem_scales[:n]
+        idx = _top_k_indices(scores, top_k, self._mem_ids)
 
-        scored.sort(key=lambda x: x[1], reverse=True)
         return [
-            SearchResult(id=doc_id, score=score, metadata=metadata)
-            for doc_id, score, metadata in scored[:top_k]
+            SearchResult(id=self._mem_ids[i], score=float(scores[i]), metadata=self._mem_meta[i])
+            for i in idx
         ]
 
-    def _search_chroma(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
+    def _search_chroma(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
         """Search ChromaDB."""
         results = self._collection.query(
-            query_embeddings=[query],
+            query_embeddings=[query.values],
             n_results=top_k,
             include=["metadatas", "distances", "embeddings" if include_embeddings else []]
         )
@@ -575,11 +1302,11 @@ class VectorDBBridge:
 
         return output
 
-    def _search_pinecone(self, query: List[float], top_k: int, filter: Dict = None) -> List[SearchResult]:
+    def _search_pinecone(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
         """Search Pinecone."""
         search_params = {
             "top_k": top_k,
-            "vector": query,
+            "vector": query.values,
             "include_metadata": True
         }
 
@@ -597,9 +1324,9 @@ class VectorDBBridge:
             for match in results.get("matches", [])
         ]
 
-    def _search_weaviate(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
+    def _search_weaviate(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
         """Search Weaviate."""
-        near_vector = {"vector": query}
+        near_vector = {"vector": query.values}
 
         query_obj = self._client.query.get(
             class_name=self.collection,
@@ -623,11 +1350,11 @@ class VectorDBBridge:
 
         return output
 
-    def _search_qdrant(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
+    def _search_qdrant(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
         """Search Qdrant."""
         results = self._client.search(
             collection_name=self.collection,
-            query_vector=query,
+            query_vector=query.values,
             limit=top_k
         )
 
@@ -636,78 +1363,145 @@ class VectorDBBridge:
                 id=hit.id,
                 score=hit.score,
                 embedding=hit.vector if include_embeddings and hasattr(hit, 'vector') else None,
-                metadata=hit.payload or {}
+                metadata=hit.payload or _EMPTY_META
             )
             for hit in results
         ]
 
-    def _search_milvus(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
+    def _search_milvus(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
         """Search Milvus."""
-        results = self._client.search(
-            collection_name=self._collection,
-            query_records=[query],
-            top_k=top_k
+        results = self._collection.search(
+            data=[query.values],
+            anns_field="embedding",
+            param={"metric_type": self._milvus_metric, "params": {"ef": max(64, top_k)}},
+            limit=top_k,
+            output_fields=["embedding", "metadata"] if include_embeddings else ["metadata"]
         )
 
+        # L2 is a distance; negate it so higher is better like the other metrics.
+        sign = -1.0 if self._milvus_metric == "L2" else 1.0
         output = []
         for hits in results:
             for hit in hits:
+                metadata = hit.entity.get("metadata")
                 output.append(SearchResult(
                     id=str(hit.id),
-                    score=hit.score,
-                    embedding=query if include_embeddings else None,
-                    metadata={}
+                    score=sign * float(hit.distance),
+                    embedding=list(hit.entity.get("embedding")) if include_embeddings else None,
+                    metadata=_loads(metadata) if metadata else {}
                 ))
         return output
 
-    def _search_pgvector(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
-        """Search pgvector."""
-        import json
-        conn = self._get_pgvector_connection()
-        with conn.cursor() as cur:
+    def _search_pgvector(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
+        """Search pgvector, ordering and scoring with the metric's distance operator in Postgres."""
+        distance = f"embedding {self._pg_operator} %(query)s"
+        embedding_col = "embedding" if include_embeddings else "NULL"
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
             cur.execute(
-                f"SELECT id, embedding, metadata FROM {self._table_name} ORDER BY embedding <-> %s LIMIT %s",
-                (query, top_k)
+                f"SELECT id, {embedding_col}, metadata, {self._pg_score.format(dist=distance)} AS score "
+                f"FROM {self._table_name} ORDER BY {distance} LIMIT %(top_k)s",
+                {"query": query.arr, "top_k": top_k}
             )
             rows = cur.fetchall()
             return [
                 SearchResult(
                     id=row[0],
-                    score=1.0 - self._cosine_similarity(query, row[1]),
-                    embedding=row[1] if include_embeddings else None,
-                    metadata=json.loads(row[2]) if row[2] else {}
+                    score=float(row[3]),
+                    embedding=row[1].tolist() if row[1] is not None else None,
+                    metadata=_loads(row[2]) if row[2] else {}
                 )
                 for row in rows
             ]
 
-    def _search_redis(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
-        """Search Redis using brute force (for small datasets)."""
-        import json
+    def _search_redis(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
+        """Search Redis with a RediSearch KNN query, or brute force when RediSearch is missing."""
         client = self._get_redis_client()
-        all_ids = list(client.smembers(f"{self._index_name}:ids"))
+        if self._redis_knn:
+            try:
+                return self._search_redis_knn(client, query, top_k, include_embeddings)
+            except RedisResponseError as e:
+                # Only a missing module or index disables KNN; errors caused by
+                # this query (bad dimension, syntax, ...) must not.
+                message = str(e).lower()
+                if not any(reason in message for reason in REDIS_KNN_UNAVAILABLE_ERRORS):
+                    raise
+                logger.warning(f"RediSearch KNN query failed, using brute-force search: {e}")
+                self._redis_knn = False
+        return self._search_redis_scan(client, query, top_k, include_embeddings)
+
+    def _search_redis_knn(self, client, query: _QueryVec, top_k: int, include_embeddings: bool) -> List[SearchResult]:
+        """Run one FT.SEARCH KNN query against the collection's vector index."""
+        collection = "".join(c if c.isalnum() else f"\\{c}" for c in self.collection)
+        knn = (
+            RedisQuery(f"(@collection:{{{collection}}})=>[KNN {int(top_k)} @vector $vec AS dist]")
+            .sort_by("dist")
+            .return_fields("metadata", "dist")
+            .paging(0, top_k)
+            .dialect(2)
+        )
+        docs = client.ft(self._index_name).search(
+            knn, query_params={"vec": query.bytes}
+        ).docs
+
+        ids = [doc.id[len("doc:"):] for doc in docs]
+        embeddings = [None] * len(docs)
+        if include_embeddings and docs:
+            pipe = client.pipeline(transaction=False)
+            for doc in docs:
+                pipe.hgetall(doc.id)
+            embeddings = [
+                self._redis_embedding(data).tolist() if data else None
+                for data in pipe.execute()
+            ]
 
-        scored = []
-        for doc_id in all_ids:
-            key = f"doc:{doc_id}"
-            data = client.hgetall(key)
-            if data:
-                embedding = json.loads(data.get(b"embedding", b"[]"))
-                score = self._cosine_similarity(query, embedding)
-                scored.append((doc_id, score, json.loads(data.get(b"metadata", b"{}"))))
+        # COSINE and IP distances are 1 - similarity; L2 is negated so higher is better.
+        score = (lambda d: -d) if self._redis_metric == "L2" else (lambda d: 1.0 - d)
+        return [
+            SearchResult(
+                id=doc_id,
+                score=score(float(doc.dist)),
+                embedding=embedding,
+                metadata=_loads(doc.metadata) if getattr(doc, "metadata", None) else {}
+            )
+            for doc_id, doc, embedding in zip(ids, docs, embeddings)
+        ]
+
+    def _search_redis_scan(self, client, query: _QueryVec, top_k: int, include_embeddings: bool) -> List[SearchResult]:
+        """Brute-force search over every document of the collection, fetched in one pipeline."""
+        all_ids = [
+            doc_id.decode() if isinstance(doc_id, bytes) else doc_id
+            for doc_id in client.smembers(f"{self._index_name}:ids")
+        ]
 
-        scored.sort(key=lambda x: x[1], reverse=True)
+        pipe = client.pipeline(transaction=False)
+        for doc_id in all_ids:
+            pipe.hgetall(f"doc:{doc_id}")
+        docs = [(doc_id, data) for doc_id, data in zip(all_ids, pipe.execute()) if data]
+        if not docs:
+            return []
+
+        matrix = np.empty((len(docs), query.arr.shape[0]), dtype=np.float32)
+        for i, (_, data) in enumerate(docs):
+            matrix[i] = self._redis_embedding(data)
+        kernel = dot_vector_to_matrix if self.normalized else cosine_vector_to_matrix
+        scores = kernel(query.arr_norm, matrix, np.empty(len(docs), dtype=np.float32))
+
+        order = _top_k_indices(scores, top_k, [doc_id for doc_id, _ in docs])
         return [
-            SearchResult(id=doc_id, score=score, metadata=metadata)
-            for doc_id, score, metadata in scored[:top_k]
+            SearchResult(
+                id=docs[i][0],
+                score=float(scores[i]),
+                embedding=matrix[i].tolist() if include_embeddings else None,
+                metadata=_loads(docs[i][1].get(b"metadata", b"{}"))
+            )
+            for i in order
         ]
 
-    def _search_azure(self, query: List[float], top_k: int, include_embeddings: bool) -> List[SearchResult]:
+    def _search_azure(self, query: _QueryVec, top_k: int, filter: Dict = None, include_embeddings: bool = False) -> List[SearchResult]:
         """Search Azure AI Search."""
-        from azure.search.documents.models import VectorQuery
-
         results = self._search_client.search(
             search_text=None,
-            vector_queries=[VectorQuery(vector=query, k=top_k, fields="embedding")],
+            vector_queries=[VectorQuery(vector=query.values, k=top_k, fields="embedding")],
             select=["id", "metadata"] if not include_embeddings else ["id", "embedding", "metadata"]
         )
 
@@ -723,235 +1517,239 @@ class VectorDBBridge:
 
     def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a document by ID."""
-        import json
+        return self._get_fn(doc_id)
 
-        if self.backend_name == "chroma":
-            result = self._collection.get(ids=[doc_id])
-            if result["ids"]:
-                return {
-                    "id": doc_id,
-                    "embedding": result["embeddings"][0] if result.get("embeddings") else None,
-                    "metadata": result["metadatas"][0] if result.get("metadatas") else {}
-                }
-
-        elif self.backend_name == "pinecone":
-            results = self._client.fetch(ids=[doc_id])
-            if results.get("vectors", {}):
-                vec = results["vectors"][doc_id]
-                return {
-                    "id": doc_id,
-                    "embedding": vec.get("values"),
-                    "metadata": vec.get("metadata", {})
-                }
+    def _get_chroma(self, doc_id):
+        result = self._collection.get(ids=[doc_id])
+        if result["ids"]:
+            return {
+                "id": doc_id,
+                "embedding": result["embeddings"][0] if result.get("embeddings") else None,
+                "metadata": result["metadatas"][0] if result.get("metadatas") else {}
+            }
+        return None
 
-        elif self.backend_name == "weaviate":
-            try:
-                result = self._client.data_object.get_by_id(doc_id, class_name=self.collection)
-                if result:
-                    return {
-                        "id": doc_id,
-                        "embedding": result.get("vector"),
-                        "metadata": result.get("properties", {})
-                    }
-            except:
-                pass
+    def _get_pinecone(self, doc_id):
+        results = self._client.fetch(ids=[doc_id])
+        if results.get("vectors", {}):
+            vec = results["vectors"][doc_id]
+            return {
+                "id": doc_id,
+                "embedding": vec.get("values"),
+                "metadata": vec.get("metadata", {})
+            }
+        return None
 
-        elif self.backend_name == "qdrant":
-            points = self._client.retrieve(collection_name=self.collection, ids=[doc_id])
-            if points:
-                point = points[0]
+    def _get_weaviate(self, doc_id):
+        try:
+            result = self._client.data_object.get_by_id(doc_id, class_name=self.collection)
+            if result:
                 return {
-                    "id": point.id,
-                    "embedding": point.vector,
-                    "metadata": point.payload or {}
+                    "id": doc_id,
+                    "embedding": result.get("vector"),
+                    "metadata": result.get("properties", {})
                 }
+        except:
+            pass
+        return None
 
-        elif self.backend_name == "memory":
-            if doc_id in self._memory_store:
-                embedding, metadata = self._memory_store[doc_id]
-                return {"id": doc_id, "embedding": embedding, "metadata": metadata}
-
-        elif self.backend_name == "pgvector":
-            conn = self._get_pgvector_connection()
-            with conn.cursor() as cur:
-                cur.execute(
-                    f"SELECT id, embedding, metadata FROM {self._table_name} WHERE id = %s",
-                    (doc_id,)
-                )
-                row = cur.fetchone()
-                if row:
-                    return {
-                        "id": row[0],
-                        "embedding": row[1],
-                        "metadata": json.loads(row[2]) if row[2] else {}
-                    }
+    def _get_qdrant(self, doc_id):
+        points = self._client.retrieve(collection_name=self.collection, ids=[doc_id])
+        if points:
+            point = points[0]
+            return {
+                "id": point.id,
+                "embedding": point.vector,
+                "metadata": point.payload or _EMPTY_META
+            }
+        return None
 
-        elif self.backend_name == "redis":
-            client = self._get_redis_client()
-            key = f"doc:{doc_id}"
-            data = client.hgetall(key)
-            if data:
-                return {
-                    "id": doc_id,
-                    "embedding": json.loads(data.get(b"embedding", b"[]")),
-                    "metadata": json.loads(data.get(b"metadata", b"{}"))
-                }
+    def _get_memory(self, doc_id):
+        row = self._mem_id_index.get(doc_id)
+        if row is not None:
+            return {"id": doc_id, "embedding": self._mem_embedding(row), "metadata": self._mem_meta[row]}
+        return None
 
-        elif self.backend_name == "azure":
-            try:
-                doc = self._search_client.get_document(key=doc_id)
+    def _get_pgvector(self, doc_id):
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"SELECT id, embedding, metadata FROM {self._table_name} WHERE id = %s",
+                (doc_id,)
+            )
+            row = cur.fetchone()
+            if row:
                 return {
-                    "id": doc["id"],
-                    "embedding": doc.get("embedding"),
-                    "metadata": {k: v for k, v in doc.items() if k not in ["id", "embedding"]}
+                    "id": row[0],
+                    "embedding": row[1].tolist() if row[1] is not None else None,
+                    "metadata": _loads(row[2]) if row[2] else {}
                 }
-            except:
-                pass
+        return None
 
+    def _get_redis(self, doc_id):
+        client = self._get_redis_client()
+        data = client.hgetall(f"doc:{doc_id}")
+        if data:
+            return {
+                "id": doc_id,
+                "embedding": self._redis_embedding(data).tolist(),
+                "metadata": _loads(data.get(b"metadata", b"{}"))
+            }
         return None
 
+    def _get_azure(self, doc_id):
+        try:
+            doc = self._search_client.get_document(key=doc_id)
+            return {
+                "id": doc["id"],
+                "embedding": doc.get("embedding"),
+                "metadata": {k: v for k, v in doc.items() if k not in ["id", "embedding"]}
+            }
+        except:
+            return None
+
     def delete(self, doc_id: str) -> bool:
         """Delete a document by ID."""
-        if self.backend_name == "chroma":
-            self._collection.delete(ids=[doc_id])
-            return True
+        try:
+            return self._delete_fn(doc_id)
+        finally:
+            self._invalidate_caches()
 
-        elif self.backend_name == "pinecone":
-            self._client.delete(ids=[doc_id])
-            return True
+    def _delete_chroma(self, doc_id):
+        self._collection.delete(ids=[doc_id])
+        return True
 
-        elif self.backend_name == "weaviate":
-            try:
-                self._client.data_object.delete(doc_id, class_name=self.collection)
-                return True
-            except:
-                return False
+    def _delete_pinecone(self, doc_id):
+        self._client.delete(ids=[doc_id])
+        return True
 
-        elif self.backend_name == "qdrant":
-            self._client.delete(collection_name=self.collection, points_selector=[doc_id])
+    def _delete_weaviate(self, doc_id):
+        try:
+            self._client.data_object.delete(doc_id, class_name=self.collection)
             return True
+        except:
+            return False
 
-        elif self.backend_name == "memory":
-            if doc_id in self._memory_store:
-                del self._memory_store[doc_id]
-                return True
-
-        elif self.backend_name == "pgvector":
-            import psycopg2
-            conn = self._get_pgvector_connection()
-            with conn.cursor() as cur:
-                cur.execute(f"DELETE FROM {self._table_name} WHERE id = %s", (doc_id,))
-                conn.commit()
-            return True
+    def _delete_qdrant(self, doc_id):
+        self._client.delete(collection_name=self.collection, points_selector=[doc_id])
+        return True
 
-        elif self.backend_name == "redis":
-            client = self._get_redis_client()
-            client.delete(f"doc:{doc_id}")
-            client.srem(f"{self._index_name}:ids", doc_id)
-            return True
+    def _delete_pgvector(self, doc_id):
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
+            cur.execute(f"DELETE FROM {self._table_name} WHERE id = %s", (doc_id,))
+            conn.commit()
+        return True
 
-        elif self.backend_name == "azure":
-            try:
-                self._search_client.delete_documents(documents=[{"id": doc_id}])
-                return True
-            except:
-                return False
+    def _delete_redis(self, doc_id):
+        client = self._get_redis_client()
+        client.delete(f"doc:{doc_id}")
+        client.srem(f"{self._index_name}:ids", doc_id)
+        return True
 
-        return False
+    def _delete_azure(self, doc_id):
+        try:
+            self._search_client.delete_documents(documents=[{"id": doc_id}])
+            return True
+        except:
+            return False
 
     def update_metadata(self, doc_id: str, metadata: Dict) -> bool:
         """Update document metadata."""
-        import json
+        try:
+            return self._update_metadata_fn(doc_id, metadata)
+        finally:
+            self._invalidate_caches()
 
-        if self.backend_name == "chroma":
-            self._collection.update(ids=[doc_id], metadatas=[metadata])
-            return True
+    def _update_metadata_chroma(self, doc_id, metadata):
+        self._collection.update(ids=[doc_id], metadatas=[metadata])
+        return True
 
-        elif self.backend_name == "pinecone":
-            self._client.upsert([{
-                "id": doc_id,
-                "values": None,
-                "metadata": metadata
-            }])
+    def _update_metadata_pinecone(self, doc_id, metadata):
+        self._client.upsert([{
+            "id": doc_id,
+            "values": None,
+            "metadata": metadata
+        }])
+        return True
+
+    def _update_metadata_weaviate(self, doc_id, metadata):
+        try:
+            self._client.data_object.update(doc_id, class_name=self.collection, data_object=metadata)
             return True
+        except:
+            return False
 
-        elif self.backend_name == "weaviate":
-            try:
-                self._client.data_object.update(doc_id, class_name=self.collection, data_object=metadata)
-                return True
-            except:
-                return False
+    def _update_metadata_qdrant(self, doc_id, metadata):
+        self._client.set_payload(collection_name=self.collection, payload=metadata, points=[doc_id])
+        return True
 
-        elif self.backend_name == "qdrant":
-            self._client.set_payload(collection_name=self.collection, payload=metadata, points=[doc_id])
-            return True
+    def _update_metadata_memory(self, doc_id, metadata):
+        row = self._mem_id_index.get(doc_id)
+        if row is None:
+            return False
+        self._mem_meta[row] = metadata
+        return True
 
-        elif self.backend_name == "memory":
-            if doc_id in self._memory_store:
-                embedding, _ = self._memory_store[doc_id]
-                self._memory_store[doc_id] = (embedding, metadata)
-                return True
+    def _update_metadata_pgvector(self, doc_id, metadata):
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"UPDATE {self._table_name} SET metadata = %s WHERE id = %s",
+                (_dumps(metadata).decode(), doc_id)
+            )
+            conn.commit()
+        return True
 
-        elif self.backend_name == "pgvector":
-            conn = self._get_pgvector_connection()
-            with conn.cursor() as cur:
-                cur.execute(
-                    f"UPDATE {self._table_name} SET metadata = %s WHERE id = %s",
-                    (json.dumps(metadata), doc_id)
-                )
-                conn.commit()
-            return True
+    def _update_metadata_redis(self, doc_id, metadata):
+        client = self._get_redis_client()
+        client.hset(f"doc:{doc_id}", "metadata", _dumps(metadata))
+        return True
 
-        elif self.backend_name == "redis":
-            client = self._get_redis_client()
-            client.hset(f"doc:{doc_id}", "metadata", json.dumps(metadata))
+    def _update_metadata_azure(self, doc_id, metadata):
+        try:
+            doc = self._search_client.get_document(key=doc_id)
+            doc.update(metadata)
+            self._search_client.merge_or_upload_documents(documents=[doc])
             return True
+        except:
+            return False
 
-        elif self.backend_name == "azure":
-            try:
-                doc = self._search_client.get_document(key=doc_id)
-                doc.update(metadata)
-                self._search_client.merge_or_upload_documents(documents=[doc])
-                return True
-            except:
-                return False
-
-        return False
+    def _invalidate_caches(self):
+        """Drop cached search results for this collection after a write."""
+        if self._cache:
+            self._cache.invalidate_namespace(self._cache_namespace)
+        if self._semantic_cache:
+            self._semantic_cache.clear()
 
     def count(self) -> int:
         """Get the number of documents."""
-        import json
+        return self._count_fn()
 
-        if self.backend_name == "chroma":
-            return self._collection.count()
+    def _count_chroma(self):
+        return self._collection.count()
 
-        elif self.backend_name == "pinecone":
-            stats = self._client.describe_index_stats()
-            return stats.get("total_vector_count", 0)
+    def _count_pinecone(self):
+        stats = self._client.describe_index_stats()
+        return stats.get("total_vector_count", 0)
 
-        elif self.backend_name == "qdrant":
-            return self._client.count(collection_name=self.collection).count
+    def _count_qdrant(self):
+        return self._client.count(collection_name=self.collection).count
 
-        elif self.backend_name == "memory":
-            return len(self._memory_store)
+    def _count_memory(self):
+        return len(self._mem_ids)
 
-        elif self.backend_name == "pgvector":
-            conn = self._get_pgvector_connection()
-            with conn.cursor() as cur:
-                cur.execute(f"SELECT COUNT(*) FROM {self._table_name}")
-                return cur.fetchone()[0]
-
-        elif self.backend_name == "redis":
-            client = self._get_redis_client()
-            return client.scard(f"{self._index_name}:ids")
+    def _count_pgvector(self):
+        with self._pgvector_connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) FROM {self._table_name}")
+            return cur.fetchone()[0]
 
-        elif self.backend_name == "azure":
-            try:
-                return self._search_client.get_document_count()
-            except:
-                return 0
+    def _count_redis(self):
+        client = self._get_redis_client()
+        return client.scard(f"{self._index_name}:ids")
 
-        return 0
+    def _count_azure(self):
+        try:
+            return self._search_client.get_document_count()
+        except:
+            return 0
 
     def stats(self) -> Dict[str, Any]:
         """Get database statistics."""
@@ -959,7 +1757,10 @@ class VectorDBBridge:
             "backend": self.backend_name,
             "count": self.count(),
             "dimensions": self.dimensions,
-            "metric": self.metric
+            "metric": self.metric,
+            # Whether stored vectors are unit-length: the memory backend always
+            # normalizes on insert, other backends only when normalized=True.
+            "is_normalized": self.normalized or self.backend_name == "memory"
         }
 
     def health(self) -> Dict[str, Any]:
@@ -967,36 +1768,34 @@ class VectorDBBridge:
         return {
             "circuit_breaker": self._breaker.stats(),
             "pool": self._pool.health_check(),
-            "cache": self._cache.stats() if self._cache else None
+            "cache": self._cache.stats() if self._cache else None,
+            "semantic_cache": self._semantic_cache.stats() if self._semantic_cache else None
         }
 
     def close(self):
         """Close connections and cleanup."""
         if self.backend_name == "milvus":
-            connections.disconnect()
+            connections.disconnect("default")
         elif self.backend_name == "pgvector":
-            if self._connection:
-                self._connection.close()
+            if self._pg_pool:
+                self._pg_pool.closeall()
         elif self.backend_name == "redis":
-            if self._redis_client:
-                self._redis_client.close()
+            self._redis_pool.disconnect()
 
-    @staticmethod
-    def _cosine_similarity(a: List[float], b: List[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        import math
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = math.sqrt(sum(x * x for x in a))
-        norm_b = math.sqrt(sum(x * x for x in b))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+    def _query_vec(self, query: List[float]) -> _QueryVec:
+        """Convert a query once: float32 array, its norm, a unit-length copy and raw bytes."""
+        if not NUMPY_AVAILABLE:
+            return _QueryVec(values=query)
+        arr = np.asarray(query, dtype=np.float32).ravel()
+        norm = 1.0 if self.normalized else float(np.linalg.norm(arr))
+        arr_norm = arr / norm if norm and norm != 1.0 else arr
+        return _QueryVec(values=query, arr=arr, norm=norm, arr_norm=arr_norm, bytes=arr.tobytes())
 
     @staticmethod
     def available_backends() -> Dict[str, bool]:
         """Check which backends are available."""
         return {
-            "memory": True,
+            "memory": NUMPY_AVAILABLE,
             "chroma": CHROMA_AVAILABLE,
             "pinecone": PINECONE_AVAILABLE,
             "weaviate": WEAVIATE_AVAILABLE,
@@ -1,76 +1,154 @@
 """
 VectorDB Connection Pool and Retry Utilities
 
-Provides connection pooling, retry logic with exponential backoff,
+Provides connection pooling, retry logic with jittered exponential backoff,
 health checks, and metrics tracking for vector database operations.
 """
 
 import time
-import hashlib
+import random
 import json
 import threading
-from typing import Dict, Any, Optional, Callable
+from array import array
+from typing import Dict, Any, Optional, Callable, Hashable
 from dataclasses import dataclass, field
 from datetime import datetime
-from collections import deque
+from collections import deque, OrderedDict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Smoothing factor of the latency EWMA; roughly the last 1/alpha requests dominate.
+LATENCY_EWMA_ALPHA = 0.05
+
+# Log2-scale latency histogram buckets: bucket b counts latencies of 2^b - 1 to 2^(b+1) - 2 microseconds.
+LATENCY_BUCKETS = 64
+
 @dataclass
 class RequestMetrics:
-    """Track request metrics for a backend."""
+    """
+    Track request metrics for a backend.
+    
+    Besides totals, every request updates an EWMA of latency (mean and
+    variance) and a log2-bucketed histogram, so to_dict can report recent
+    and tail latency in O(1) without keeping samples around. Per-request
+    history is only recorded when detail is set.
+    """
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    total_latency_ms: float = 0.0
+    total_latency_ns: int = 0
+    ewma_latency_ms: float = 0.0
+    ewma_latency_var: float = 0.0
+    latency_buckets: list = field(default_factory=lambda: [0] * LATENCY_BUCKETS)
+    # Recent requests as raw (wall-clock ns, latency ns, success) tuples; see history().
     latency_history: deque = field(default_factory=lambda: deque(maxlen=100))
+    detail: bool = False
     
-    def record_success(self, latency_ms: float):
+    def record_success(self, latency_ns: int):
         self.total_requests += 1
         self.successful_requests += 1
-        self.total_latency_ms += latency_ms
-        self.latency_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "latency_ms": latency_ms,
-            "success": True
-        })
-    
-    def record_failure(self, latency_ms: float):
+        self.total_latency_ns += latency_ns
+        self._observe(latency_ns)
+        if self.detail:
+            self.latency_history.append((time.time_ns(), latency_ns, True))
+    
+    def record_failure(self, latency_ns: int):
         self.total_requests += 1
         self.failed_requests += 1
-        self.latency_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "latency_ms": latency_ms,
-            "success": False
-        })
+        self._observe(latency_ns)
+        if self.detail:
+            self.latency_history.append((time.time_ns(), latency_ns, False))
+    
+    def _observe(self, latency_ns: int):
+        """Fold one latency into the EWMA and the histogram."""
+        latency_ms = latency_ns / 1e6
+        if self.total_requests == 1:
+            self.ewma_latency_ms = latency_ms
+        else:
+            diff = latency_ms - self.ewma_latency_ms
+            incr = LATENCY_EWMA_ALPHA * diff
+            self.ewma_latency_ms += incr
+            self.ewma_latency_var = (1 - LATENCY_EWMA_ALPHA) * (self.ewma_latency_var + diff * incr)
+        
+        bucket = (latency_ns // 1000 + 1).bit_length() - 1
+        self.latency_buckets[min(bucket, LATENCY_BUCKETS - 1)] += 1
+    
+    def latency_quantile_ms(self, q: float) -> float:
+        """Upper bound of the histogram bucket holding the q-quantile latency."""
+        counts = list(self.latency_buckets)
+        rank = q * sum(counts)
+        seen = 0
+        for bucket, count in enumerate(counts):
+            seen += count
+            if count and seen >= rank:
+                return ((1 << (bucket + 1)) - 2) / 1000
+        return 0.0
+    
+    def history(self) -> list:
+        """Recent requests, formatted for export."""
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(ts_ns / 1e9).isoformat(),
+                "latency_ms": latency_ns / 1e6,
+                "success": success
+            }
+            for ts_ns, latency_ns, success in list(self.latency_history)
+        ]
     
     def avg_latency_ms(self) -> float:
         if self.total_requests == 0:
             return 0.0
-        return self.total_latency_ms / self.total_requests
+        return self.total_latency_ns / self.total_requests / 1e6
     
     def success_rate(self) -> float:
         if self.total_requests == 0:
             return 1.0
         return self.successful_requests / self.total_requests
     
-    def to_dict(self) -> Dict:
-        return {
+    def to_dict(self, include_history: bool = False) -> Dict:
+        result = {
             "total_requests": self.total_requests,
             "successful_requests": self.successful_requests,
             "failed_requests": self.failed_requests,
             "avg_latency_ms": self.avg_latency_ms(),
+            "ewma_latency_ms": self.ewma_latency_ms,
+            "ewma_latency_stddev_ms": self.ewma_latency_var ** 0.5,
+            "p50_latency_ms": self.latency_quantile_ms(0.5),
+            "p99_latency_ms": self.latency_quantile_ms(0.99),
             "success_rate": self.success_rate()
         }
+        if include_history:
+            result["latency_history"] = self.history()
+        return result
+
+
+@dataclass(frozen=True)
+class DecorrelatedJitter:
+    """
+    Retry policy with decorrelated jitter backoff.
+
+    Each delay is drawn uniformly from [base, previous delay * 3] and capped,
+    so clients retrying after a shared outage spread out instead of retrying
+    in lockstep.
+    """
+    base: float = 0.05
+    cap: float = 2.0
+    max_attempts: int = 3
+
+    def next_delay(self, previous: float) -> float:
+        """Delay before the next attempt, given the previous delay (or base for the first retry)."""
+        return min(self.cap, random.uniform(self.base, max(self.base, previous) * 3))
 
 
 class ConnectionPool:
     """
     Connection pool for managing database connections.
     
-    Maintains a pool of connections and provides methods for
-    acquiring and releasing connections.
+    The backends keep their own clients and driver-level pools (pgvector's
+    ThreadedConnectionPool, redis.ConnectionPool, ...), so this pool does not
+    hand out connections: it bounds the number of concurrent operations per
+    backend to max_connections and retries connection failures.
     """
     
     def __init__(
@@ -79,72 +157,73 @@ class ConnectionPool:
         connection_timeout: float = 30.0,
         max_retries: int = 3,
         retry_base_delay: float = 0.1,
-        retry_max_delay: float = 10.0
+        retry_max_delay: float = 10.0,
+        detailed_metrics: bool = False
     ):
         self.max_connections = max_connections
         self.connection_timeout = connection_timeout
         self.max_retries = max_retries
         self.retry_base_delay = retry_base_delay
         self.retry_max_delay = retry_max_delay
+        self.retry_policy = DecorrelatedJitter(
+            base=retry_base_delay,
+            cap=retry_max_delay,
+            max_attempts=max_retries + 1
+        )
         
-        self._connections = []
-        self._available = threading.Semaphore(max_connections)
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._in_use = 0
         self._lock = threading.Lock()
-        self._metrics = RequestMetrics()
+        self._metrics = RequestMetrics(detail=detailed_metrics)
         self._healthy = True
         
     def execute_with_retry(
         self,
         operation: Callable,
         *args,
+        attempt_policy: Optional[DecorrelatedJitter] = None,
         **kwargs
     ) -> Any:
         """
-        Execute an operation with exponential backoff retry.
+        Execute an operation, retrying connection failures with decorrelated jitter.
         
         Args:
             operation: Callable to execute
             *args: Positional arguments for operation
+            attempt_policy: Retry policy; defaults to the pool's retry_policy
             **kwargs: Keyword arguments for operation
             
         Returns:
             Result of operation
             
         Raises:
-            Exception: After max_retries exceeded
+            Exception: After the policy's max_attempts are exhausted
         """
+        policy = attempt_policy or self.retry_policy
         last_exception = None
+        delay = policy.base
         
-        for attempt in range(self.max_retries + 1):
-            start_time = time.time()
+        for attempt in range(policy.max_attempts):
+            start_ns = time.monotonic_ns()
             
             try:
-                # Try to acquire connection
-                if not self._available.acquire(timeout=self.connection_timeout):
-                    raise TimeoutError("Connection pool exhausted")
-                
+                self._checkout()
                 try:
                     result = operation(*args, **kwargs)
-                    latency_ms = (time.time() - start_time) * 1000
-                    self._metrics.record_success(latency_ms)
+                    self._metrics.record_success(time.monotonic_ns() - start_ns)
                     self._healthy = True
                     return result
-                    
                 finally:
-                    self._available.release()
+                    self._release()
                     
             except (ConnectionError, TimeoutError, OSError) as e:
                 last_exception = e
-                latency_ms = (time.time() - start_time) * 1000
-                self._metrics.record_failure(latency_ms)
+                self._metrics.record_failure(time.monotonic_ns() - start_ns)
                 
-                if attempt < self.max_retries:
-                    delay = min(
-                        self.retry_base_delay * (2 ** attempt),
-                        self.retry_max_delay
-                    )
+                if attempt < policy.max_attempts - 1:
+                    delay = policy.next_delay(delay)
                     logger.warning(
-                        f"Operation failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}. "
+                        f"Operation failed (attempt {attempt + 1}/{policy.max_attempts}): {e}. "
                         f"Retrying in {delay:.2f}s..."
                     )
                     time.sleep(delay)
@@ -153,12 +232,24 @@ class ConnectionPool:
                     raise
             
             except Exception as e:
-                latency_ms = (time.time() - start_time) * 1000
-                self._metrics.record_failure(latency_ms)
+                self._metrics.record_failure(time.monotonic_ns() - start_ns)
                 raise
         
         raise last_exception
     
+    def _checkout(self):
+        """Take an operation slot, waiting up to connection_timeout for one to free up."""
+        if not self._slots.acquire(timeout=self.connection_timeout):
+            raise TimeoutError("Connection pool exhausted")
+        with self._lock:
+            self._in_use += 1
+    
+    def _release(self):
+        """Give back an operation slot."""
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Perform a health check on the connection pool.
@@ -169,7 +260,7 @@ class ConnectionPool:
         return {
             "healthy": self._healthy,
             "metrics": self._metrics.to_dict(),
-            "available_connections": self._available._value,
+            "available_connections": self.max_connections - self._in_use,
             "max_connections": self.max_connections
         }
     
@@ -184,9 +275,17 @@ class ConnectionPool:
 
 class QueryCache:
     """
-    Simple TTL-based cache for search queries.
+    TTL-based LRU cache for search queries.
     
-    Caches search results to reduce redundant database calls.
+    Caches search results to reduce redundant database calls. Entries are kept
+    in recency order, so eviction pops the least recently used one in O(1).
+    Each entry is an immutable (expiry_ns, results) tuple, so hits are served
+    without taking the lock; only inserts and evictions wait for it.
+    
+    Keys are scoped by a namespace (one per collection) and its write
+    generation: invalidate_namespace bumps the generation, so a write makes
+    every earlier result for that namespace unreachable in O(1); the orphaned
+    entries age out through the LRU.
     """
     
     def __init__(
@@ -196,63 +295,108 @@ class QueryCache:
     ):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._cache = {}
+        self._ttl_ns = int(ttl_seconds * 1e9)
+        self._cache: OrderedDict = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
         self._lock = threading.Lock()
         self._hits = 0
         self._misses = 0
     
-    def _make_key(self, query: list, top_k: int, filter: Optional[dict]) -> str:
-        """Create a cache key from query parameters."""
-        query_hash = hashlib.sha256(
-            json.dumps(query, sort_keys=True).encode()
-        ).hexdigest()
-        
-        filter_hash = hashlib.sha256(
-            json.dumps(filter or {}, sort_keys=True).encode()
-        ).hexdigest() if filter else "nofilter"
+    @staticmethod
+    def _filter_key(filter: Optional[dict]):
+        """Hashable, order-independent form of a search filter."""
+        if not filter:
+            return None
+        try:
+            return frozenset(filter.items())
+        except TypeError:
+            # Unhashable values (lists, nested dicts): fall back to canonical JSON.
+            return json.dumps(filter, sort_keys=True)
+
+    def _make_key(self, query: list, top_k: int, filter: Optional[dict], namespace: Hashable = None) -> tuple:
+        """
+        Create a cache key from query parameters.
         
-        return f"{query_hash}_{filter_hash}_{top_k}"
+        The query's float32 bytes are used as-is; the dict hashes them natively,
+        which is cheaper than digesting them first.
+        """
+        return (
+            namespace,
+            self._generations.get(namespace, 0),
+            array("f", query).tobytes(),
+            self._filter_key(filter),
+            top_k
+        )
+    
+    def generation(self, namespace: Hashable = None) -> int:
+        """Current write generation of a namespace."""
+        return self._generations.get(namespace, 0)
     
-    def get(self, query: list, top_k: int, filter: Optional[dict]) -> Optional[list]:
+    def invalidate_namespace(self, namespace: Hashable = None):
+        """Drop every cached result of a namespace, e.g. after a write to its collection."""
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+    
+    def get(self, query: list, top_k: int, filter: Optional[dict], namespace: Hashable = None) -> Optional[list]:
         """
         Get cached results for a query.
         
         Returns:
             Cached results or None if not found/expired
         """
-        key = self._make_key(query, top_k, filter)
+        key = self._make_key(query, top_k, filter, namespace)
         
-        with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-            
-            cached = self._cache[key]
-            if time.time() - cached["timestamp"] > self.ttl_seconds:
-                del self._cache[key]
-                self._misses += 1
-                return None
-            
-            self._hits += 1
-            return cached["results"]
+        # Single dict lookup, atomic under the GIL; hit/miss counts may race by one.
+        cached = self._cache.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        
+        if time.monotonic_ns() > cached[0]:
+            with self._lock:
+                if self._cache.get(key) is cached:
+                    del self._cache[key]
+            self._misses += 1
+            return None
+        
+        # Refresh recency only if nobody else holds the lock; a hit never waits.
+        if self._lock.acquire(blocking=False):
+            try:
+                self._cache.move_to_end(key)
+            except KeyError:
+                pass
+            finally:
+                self._lock.release()
+        self._hits += 1
+        return cached[1]
     
-    def set(self, query: list, top_k: int, filter: Optional[dict], results: list):
-        """Cache search results."""
-        key = self._make_key(query, top_k, filter)
+    def set(
+        self,
+        query: list,
+        top_k: int,
+        filter: Optional[dict],
+        results: list,
+        namespace: Hashable = None,
+        generation: Optional[int] = None
+    ):
+        """
+        Cache search results.
+        
+        Pass the generation read before running the search; if the namespace
+        was written to meanwhile the results may be stale and are not cached.
+        """
+        key = self._make_key(query, top_k, filter, namespace)
+        
+        entry = (time.monotonic_ns() + self._ttl_ns, results)
         
         with self._lock:
-            # Evict oldest if at capacity
-            if len(self._cache) >= self.max_size:
-                oldest_key = min(
-                    self._cache.keys(),
-                    key=lambda k: self._cache[k]["timestamp"]
-                )
-                del self._cache[oldest_key]
-            
-            self._cache[key] = {
-                "results": results,
-                "timestamp": time.time()
-            }
+            current = self._generations.get(namespace, 0)
+            if key[1] != current or (generation is not None and generation != current):
+                return
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
     
     def clear(self):
         """Clear the cache."""
@@ -272,9 +416,9 @@ class QueryCache:
             "hit_rate": hit_rate
         }
     
-    def invalidate(self, query: list, top_k: int, filter: Optional[dict] = None):
+    def invalidate(self, query: list, top_k: int, filter: Optional[dict] = None, namespace: Hashable = None):
         """Invalidate cached results for a specific query."""
-        key = self._make_key(query, top_k, filter)
+        key = self._make_key(query, top_k, filter, namespace)
         
         with self._lock:
             self._cache.pop(key, None)
@@ -288,6 +432,10 @@ class CircuitBreaker:
     - CLOSED: Normal operation
     - OPEN: Failing, reject requests
     - HALF_OPEN: Testing if service recovered
+    
+    The CLOSED-state checks on the success path read _state without the
+    lock (attribute reads and writes are atomic under the GIL); failures
+    and state transitions are serialized by the lock.
     """
     
     CLOSED = "closed"
@@ -303,11 +451,12 @@ class CircuitBreaker:
         self.failure_threshold = failure_threshold
         self.success_threshold = success_threshold
         self.timeout_seconds = timeout_seconds
+        self._timeout_ns = int(timeout_seconds * 1e9)
         
         self._state = self.CLOSED
         self._failure_count = 0
         self._success_count = 0
-        self._last_failure_time = None
+        self._last_failure_ns = None
         self._lock = threading.Lock()
     
     def __enter__(self):
@@ -326,14 +475,22 @@ class CircuitBreaker:
             self.record_failure()
         return False
     
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Call func(*args, **kwargs) under circuit breaker protection."""
+        with self:
+            return func(*args, **kwargs)
+    
     def can_execute(self) -> bool:
         """Check if execution is allowed."""
+        if self._state == self.CLOSED:
+            return True
+        
         with self._lock:
             if self._state == self.CLOSED:
                 return True
             
             if self._state == self.OPEN:
-                if time.time() - self._last_failure_time >= self.timeout_seconds:
+                if time.monotonic_ns() - self._last_failure_ns >= self._timeout_ns:
                     self._state = self.HALF_OPEN
                     self._success_count = 0
                     return True
@@ -344,6 +501,11 @@ class CircuitBreaker:
     
     def record_success(self):
         """Record a successful execution."""
+        if self._state == self.CLOSED:
+            if self._failure_count:
+                self._failure_count = 0
+            return
+        
         with self._lock:
             if self._state == self.HALF_OPEN:
                 self._success_count += 1
@@ -357,7 +519,7 @@ class CircuitBreaker:
         """Record a failed execution."""
         with self._lock:
             self._failure_count += 1
-            self._last_failure_time = time.time()
+            self._last_failure_ns = time.monotonic_ns()
             
             if self._state == self.HALF_OPEN:
                 self._state = self.OPEN
@@ -371,10 +533,10 @@ class CircuitBreaker:
     
     def _retry_after(self) -> float:
         """Get seconds until retry is allowed."""
-        if self._last_failure_time is None:
+        if self._last_failure_ns is None:
             return 0.0
-        remaining = self.timeout_seconds - (time.time() - self._last_failure_time)
-        return max(0.0, remaining)
+        remaining_ns = self._timeout_ns - (time.monotonic_ns() - self._last_failure_ns)
+        return max(0.0, remaining_ns / 1e9)
     
     def stats(self) -> Dict[str, Any]:
         """Get circuit breaker stats."""
@@ -396,47 +558,52 @@ class CircuitBreakerOpen(Exception):
 _pools: Dict[str, ConnectionPool] = {}
 _caches: Dict[str, QueryCache] = {}
 _breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+def _get_or_create(registry: Dict[str, Any], backend: str, factory: Callable[[], Any]) -> Any:
+    """Return registry[backend], creating it once under the lock if missing."""
+    instance = registry.get(backend)
+    if instance is None:
+        with _registry_lock:
+            instance = registry.get(backend)
+            if instance is None:
+                instance = registry[backend] = factory()
+    return instance
 
 def get_pool(backend: str) -> ConnectionPool:
     """Get or create connection pool for a backend."""
-    if backend not in _pools:
-        _pools[backend] = ConnectionPool(
-            max_connections=10,
-            max_retries=3,
-            retry_base_delay=0.1
-        )
-    return _pools[backend]
+    return _get_or_create(_pools, backend, lambda: ConnectionPool(
+        max_connections=10,
+        max_retries=2,
+        retry_base_delay=0.05,
+        retry_max_delay=2.0
+    ))
 
 def get_cache(backend: str) -> QueryCache:
     """Get or create cache for a backend."""
-    if backend not in _caches:
-        _caches[backend] = QueryCache(
-            max_size=1000,
-            ttl_seconds=300.0
-        )
-    return _caches[backend]
+    return _get_or_create(_caches, backend, lambda: QueryCache(
+        max_size=1000,
+        ttl_seconds=300.0
+    ))
 
 def get_breaker(backend: str) -> CircuitBreaker:
     """Get or create circuit breaker for a backend."""
-    if backend not in _breakers:
-        _breakers[backend] = CircuitBreaker(
-            failure_threshold=5,
-            success_threshold=3,
-            timeout_seconds=30.0
-        )
-    return _breakers[backend]
+    return _get_or_create(_breakers, backend, lambda: CircuitBreaker(
+        failure_threshold=5,
+        success_threshold=3,
+        timeout_seconds=30.0
+    ))
 
 def health_check_all() -> Dict[str, Any]:
     """Check health of all backends."""
     results = {}
-    for backend in _pools:
-        pool = _pools[backend]
-        breaker = _breakers[backend]
+    for backend, pool in list(_pools.items()):
+        breaker = _breakers.get(backend)
         cache = _caches.get(backend)
         
         results[backend] = {
             "pool": pool.health_check(),
-            "circuit_breaker": breaker.stats(),
+            "circuit_breaker": breaker.stats() if breaker else None,
             "cache": cache.stats() if cache else None
         }
     
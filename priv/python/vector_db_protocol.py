@@ -5,14 +5,43 @@ Provides JSON-RPC style interface for Elixir integration.
 Allows Elixir to call Python vector database operations.
 """
 
+import os
 import json
 import sys
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 from vector_db_bridge import VectorDBBridge, SearchResult
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=dict, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=dict).encode()
+
+    _loads = json.loads
+
 # Protocol version
 PROTOCOL_VERSION = "1.0"
 
+# stdin is read in chunks of this size; responses to the requests in one
+# chunk are written together, or earlier once this many bytes are pending.
+READ_CHUNK_BYTES = 64 * 1024
+FLUSH_BYTES = 32 * 1024
+
+# Live bridges kept per distinct configuration; the least recently used is closed beyond this.
+BRIDGE_CACHE_SIZE = 128
+
+# The state handed back to Elixir only identifies a bridge; requests are
+# served by the live instance registered under that state's key.
+_bridges: "OrderedDict[tuple, VectorDBBridge]" = OrderedDict()
+_bridges_lock = threading.Lock()
+
 def bridge_init(backend: str, config: Dict) -> Dict:
     """Initialize a vector database backend."""
     try:
@@ -33,7 +62,10 @@ def bridge_init(backend: str, config: Dict) -> Dict:
             "host": config.get("host"),
             "api_key": config.get("api_key"),
             "dimensions": config.get("dimensions", 384),
-            "metric": config.get("metric", "cosine")
+            "metric": config.get("metric", "cosine"),
+            "normalized": config.get("normalized", False),
+            "semantic_cache_threshold": config.get("semantic_cache_threshold"),
+            "embedding_dtype": config.get("embedding_dtype")
         }
 
         # Filter out None values
@@ -41,13 +73,20 @@ def bridge_init(backend: str, config: Dict) -> Dict:
 
         bridge = VectorDBBridge(**kwargs)
 
+        state = {
+            "backend": normalized_backend,
+            "collection": kwargs.get("collection", "default"),
+            "dimensions": kwargs["dimensions"],
+            "normalized": kwargs["normalized"],
+            "semantic_cache_threshold": kwargs.get("semantic_cache_threshold"),
+            "embedding_dtype": kwargs.get("embedding_dtype"),
+            "initialized": True
+        }
+        _register_bridge(state, bridge)
+
         return {
             "status": "ok",
-            "state": {
-                "backend": normalized_backend,
-                "collection": kwargs.get("collection", "default"),
-                "initialized": True
-            }
+            "state": state
         }
     except Exception as e:
         return {
@@ -100,15 +139,17 @@ def bridge_search(state: Dict, query: List[float], top_k: int, filter: Optional[
             include_embeddings=include_embeddings
         )
 
-        parsed_results = [
-            {
-                "id": r.id,
-                "score": r.score,
-                "embedding": r.embedding,
-                "metadata": r.metadata
-            }
-            for r in results
-        ]
+        # Without include_embeddings every hit's embedding is None; leave the key out.
+        if include_embeddings:
+            parsed_results = [
+                {"id": r.id, "score": r.score, "embedding": r.embedding, "metadata": r.metadata}
+                for r in results
+            ]
+        else:
+            parsed_results = [
+                {"id": r.id, "score": r.score, "metadata": r.metadata}
+                for r in results
+            ]
 
         return {
             "status": "ok",
@@ -212,8 +253,10 @@ def bridge_stats(state: Dict) -> Dict:
 def bridge_close(state: Dict) -> Dict:
     """Close database connection."""
     try:
-        bridge = _restore_bridge(state)
-        bridge.close()
+        with _bridges_lock:
+            bridge = _bridges.pop(_bridge_key(state), None)
+        if bridge is not None:
+            bridge.close()
 
         return {
             "status": "ok"
@@ -231,80 +274,183 @@ def bridge_available_backends() -> Dict:
         "backends": VectorDBBridge.available_backends()
     }
 
+def _bridge_key(state: Dict) -> tuple:
+    """Identify the bridge a state refers to by its configuration."""
+    return (
+        state.get("backend", "memory"),
+        state.get("collection", "default"),
+        state.get("dimensions", 384),
+        state.get("normalized", False),
+        state.get("semantic_cache_threshold"),
+        state.get("embedding_dtype")
+    )
+
+def _register_bridge(state: Dict, bridge: VectorDBBridge):
+    """Make bridge the live instance for state, closing any it replaces or evicts."""
+    key = _bridge_key(state)
+    with _bridges_lock:
+        stale = [_bridges.pop(key)] if key in _bridges else []
+        _bridges[key] = bridge
+        while len(_bridges) > BRIDGE_CACHE_SIZE:
+            stale.append(_bridges.popitem(last=False)[1])
+    for old in stale:
+        old.close()
+
 def _restore_bridge(state: Dict) -> VectorDBBridge:
-    """Restore a VectorDBBridge from state."""
-    # In production, we'd properly serialize/deserialize
-    # For now, reinitialize with stored config
-    return VectorDBBridge(
-        backend=state.get("backend", "memory"),
-        collection=state.get("collection", "default"),
-        dimensions=state.get("dimensions", 384)
+    """Return the live VectorDBBridge for state, creating it if this process has none."""
+    key = _bridge_key(state)
+    with _bridges_lock:
+        bridge = _bridges.get(key)
+        if bridge is not None:
+            _bridges.move_to_end(key)
+            return bridge
+
+    backend, collection, dimensions, normalized, semantic_cache_threshold, embedding_dtype = key
+    bridge = VectorDBBridge(
+        backend=backend,
+        collection=collection,
+        dimensions=dimensions,
+        normalized=normalized,
+        semantic_cache_threshold=semantic_cache_threshold,
+        embedding_dtype=embedding_dtype
+    )
+    with _bridges_lock:
+        existing = _bridges.get(key)
+        if existing is None:
+            _bridges[key] = bridge
+    if existing is not None:
+        bridge.close()
+        return existing
+    return bridge
+
+# JSON-RPC style dispatcher: each adapter pulls its method's arguments out of params.
+def _dispatch_init(params: Dict) -> Dict:
+    return bridge_init(params.get("backend"), params.get("config", {}))
+
+def _dispatch_add(params: Dict) -> Dict:
+    return bridge_add(
+        params.get("state", {}),
+        params.get("id"),
+        params.get("embedding", []),
+        params.get("metadata", {})
+    )
+
+def _dispatch_add_batch(params: Dict) -> Dict:
+    return bridge_add_batch(
+        params.get("state", {}),
+        params.get("documents", [])
+    )
+
+def _dispatch_search(params: Dict) -> Dict:
+    return bridge_search(
+        params.get("state", {}),
+        params.get("query", []),
+        params.get("top_k", 10),
+        params.get("filter"),
+        params.get("include_embeddings", False)
     )
 
-# JSON-RPC style dispatcher
+def _dispatch_get(params: Dict) -> Dict:
+    return bridge_get(params.get("state", {}), params.get("id"))
+
+def _dispatch_delete(params: Dict) -> Dict:
+    return bridge_delete(params.get("state", {}), params.get("id"))
+
+def _dispatch_update_metadata(params: Dict) -> Dict:
+    return bridge_update_metadata(
+        params.get("state", {}),
+        params.get("id"),
+        params.get("metadata", {})
+    )
+
+def _dispatch_count(params: Dict) -> Dict:
+    return bridge_count(params.get("state", {}))
+
+def _dispatch_stats(params: Dict) -> Dict:
+    return bridge_stats(params.get("state", {}))
+
+def _dispatch_close(params: Dict) -> Dict:
+    return bridge_close(params.get("state", {}))
+
+def _dispatch_available_backends(params: Dict) -> Dict:
+    return bridge_available_backends()
+
+DISPATCH = {
+    "init": _dispatch_init,
+    "add": _dispatch_add,
+    "add_batch": _dispatch_add_batch,
+    "search": _dispatch_search,
+    "get": _dispatch_get,
+    "delete": _dispatch_delete,
+    "update_metadata": _dispatch_update_metadata,
+    "count": _dispatch_count,
+    "stats": _dispatch_stats,
+    "close": _dispatch_close,
+    "available_backends": _dispatch_available_backends
+}
+
 def handle_request(request: Dict) -> Dict:
     """Handle a JSON-RPC style request."""
     method = request.get("method")
-    params = request.get("params", {})
-
-    handlers = {
-        "init": lambda: bridge_init(params.get("backend"), params.get("config", {})),
-        "add": lambda: bridge_add(
-            params.get("state", {}),
-            params.get("id"),
-            params.get("embedding", []),
-            params.get("metadata", {})
-        ),
-        "add_batch": lambda: bridge_add_batch(
-            params.get("state", {}),
-            params.get("documents", [])
-        ),
-        "search": lambda: bridge_search(
-            params.get("state", {}),
-            params.get("query", []),
-            params.get("top_k", 10),
-            params.get("filter"),
-            params.get("include_embeddings", False)
-        ),
-        "get": lambda: bridge_get(params.get("state", {}), params.get("id")),
-        "delete": lambda: bridge_delete(params.get("state", {}), params.get("id")),
-        "update_metadata": lambda: bridge_update_metadata(
-            params.get("state", {}),
-            params.get("id"),
-            params.get("metadata", {})
-        ),
-        "count": lambda: bridge_count(params.get("state", {})),
-        "stats": lambda: bridge_stats(params.get("state", {})),
-        "close": lambda: bridge_close(params.get("state", {})),
-        "available_backends": lambda: bridge_available_backends()
-    }
-
-    handler = handlers.get(method)
+    handler = DISPATCH.get(method)
     if handler:
-        return handler()
+        return handler(request.get("params", {}))
     else:
         return {
             "status": "error",
             "message": f"Unknown method: {method}"
         }
 
+def _handle_line(line: bytes) -> bytes:
+    """Decode one request line, dispatch it and encode the response."""
+    try:
+        return _dumps(handle_request(_loads(line)))
+    except json.JSONDecodeError as e:
+        return _dumps({
+            "status": "error",
+            "message": f"Invalid JSON: {str(e)}"
+        })
+    except Exception as e:
+        return _dumps({
+            "status": "error",
+            "message": str(e)
+        })
+
+def serve(fd: int, out) -> None:
+    """
+    Serve newline-delimited requests from fd until EOF.
+
+    Every complete line in a read is answered before the next read, and
+    the answers are flushed together, so a burst of requests costs one
+    write instead of one per request.
+    """
+    pending = bytearray()
+    responses = bytearray()
+    while True:
+        chunk = os.read(fd, READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        pending += chunk
+        if b"\n" not in chunk:
+            continue
+
+        *lines, rest = pending.split(b"\n")
+        pending = bytearray(rest)
+        for line in lines:
+            responses += _handle_line(line) + b"\n"
+            if len(responses) >= FLUSH_BYTES:
+                out.write(responses)
+                out.flush()
+                responses.clear()
+        if responses:
+            out.write(responses)
+            out.flush()
+            responses.clear()
+
+    if pending.strip():
+        out.write(_handle_line(pending) + b"\n")
+        out.flush()
+
 # Main entry point for stdin/stdout communication
 if __name__ == "__main__":
-    """Read JSON requests from stdin, write responses to stdout."""
-    import sys
-
-    for line in sys.stdin:
-        try:
-            request = json.loads(line.strip())
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except json.JSONDecodeError as e:
-            print(json.dumps({
-                "status": "error",
-                "message": f"Invalid JSON: {str(e)}"
-            }), flush=True)
-        except Exception as e:
-            print(json.dumps({
-                "status": "error",
-                "message": str(e)
-            }), flush=True)
+    serve(sys.stdin.fileno(), sys.stdout.buffer)
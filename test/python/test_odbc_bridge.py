@@ -0,0 +1,222 @@
+"""
+Tests for priv/python/odbc_bridge.py.
+
+pyodbc is replaced by a thin sqlite3-backed stand-in, so the bridge's
+pooling and transaction handling run against a real database without an
+ODBC driver. Run with: python -m unittest discover -s test/python
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import types
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "priv", "python"))
+
+
+class _FakeCursor:
+    """
+    sqlite3 cursor exposing the pyodbc attributes the bridge touches.
+
+    Like a driver without MARS, a cursor whose results are not fully read
+    keeps the connection busy: other cursors cannot execute until it is
+    drained, advanced with nextset() or cancelled.
+    """
+
+    def __init__(self, cursor, conn):
+        self._cursor = cursor
+        self._conn = conn
+        self.fast_executemany = False
+        self.rowcount = -1
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name in ("_cursor", "_conn", "fast_executemany", "rowcount"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def _check_idle(self):
+        if self._conn.busy is not None and self._conn.busy is not self:
+            raise sqlite3.OperationalError("Connection is busy with results for another hstmt")
+
+    def _done_if_empty(self, rows):
+        if not rows and self._conn.busy is self:
+            self._conn.busy = None
+        return rows
+
+    def execute(self, sql, params=()):
+        self._check_idle()
+        self._cursor.execute(sql, params)
+        self.rowcount = self._cursor.rowcount
+        self._conn.busy = self if self._cursor.description else None
+        return self
+
+    def executemany(self, sql, params_list):
+        self._check_idle()
+        self._cursor.executemany(sql, params_list)
+        # Like pyodbc, which always leaves rowcount at -1 after executemany.
+        self.rowcount = -1
+        return self
+
+    def fetchone(self):
+        return self._done_if_empty(self._cursor.fetchone())
+
+    def fetchmany(self, size=None):
+        return self._done_if_empty(self._cursor.fetchmany(size or self._cursor.arraysize))
+
+    def fetchall(self):
+        return self._done_if_empty(self._cursor.fetchall() or [])
+
+    def nextset(self):
+        if self._conn.busy is self:
+            self._conn.busy = None
+        return False
+
+    def cancel(self):
+        self.nextset()
+
+
+class _FakeConnection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self.autocommit = False
+        self.busy = None
+
+    def cursor(self):
+        return _FakeCursor(self._conn.cursor(), self)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def _install_fake_pyodbc():
+    fake = types.ModuleType("pyodbc")
+    fake.Error = sqlite3.Error
+    fake.connect = lambda conn_str, timeout=None, attrs_before=None: _FakeConnection(
+        conn_str.split("=", 1)[1]
+    )
+    sys.modules["pyodbc"] = fake
+
+
+_install_fake_pyodbc()
+import odbc_bridge  # noqa: E402
+
+
+class ODBCBridgeTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.bridge = odbc_bridge.ODBCBridge()
+        self.pool_id = self.bridge.connect({"connection_string": f"DATABASE={self.path}"})["pool_id"]
+        self.bridge.execute(self.pool_id, "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self):
+        self.bridge.disconnect(self.pool_id)
+        os.remove(self.path)
+
+    def _persisted_ids(self):
+        with sqlite3.connect(self.path) as conn:
+            return [row[0] for row in conn.execute("SELECT id FROM items ORDER BY id")]
+
+    def test_failed_transaction_is_rolled_back_before_reuse(self):
+        result = self.bridge.transaction(self.pool_id, [
+            {"sql": "INSERT INTO items (id, name) VALUES (?, ?)", "params": [100, "partial"]},
+            {"sql": "INSERT INTO missing_table VALUES (?)", "params": [1]},
+        ])
+        self.assertEqual(result["status"], "error")
+
+        result = self.bridge.execute(self.pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", [1, "ok"])
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(self._persisted_ids(), [1])
+
+    def test_execute_many_reports_rows_written(self):
+        rows = [[i, f"item{i}"] for i in range(500)]
+        result = self.bridge.execute_many(
+            self.pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", rows, commit_every=200
+        )
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(result["affected_rows"], 500)
+        self.assertEqual(len(self._persisted_ids()), 500)
+
+    def _assert_connection_usable(self):
+        result = self.bridge.execute(self.pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", [99, "next"])
+        self.assertEqual(result["status"], "ok", result)
+
+    def test_ping_leaves_no_pending_results(self):
+        self.assertEqual(self.bridge.ping(self.pool_id)["status"], "ok")
+        self._assert_connection_usable()
+
+    def test_partial_fetch_leaves_no_pending_results(self):
+        self.bridge.execute_many(self.pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", [[1, "a"], [2, "b"]])
+        result = self.bridge.fetch(self.pool_id, "SELECT * FROM items", limit=1)
+        self.assertEqual(result["row_count"], 1)
+        self._assert_connection_usable()
+
+    def test_closed_stream_leaves_no_pending_results(self):
+        self.bridge.execute_many(self.pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", [[1, "a"], [2, "b"]])
+        stream_id = self.bridge.open_stream(self.pool_id, "SELECT * FROM items", batch_size=1)["stream_id"]
+        self.assertEqual(len(self.bridge.next_batch(stream_id)["rows"]), 1)
+        self.bridge.close_stream(stream_id)
+        self._assert_connection_usable()
+
+    def test_query_racing_a_write_does_not_cache_stale_rows(self):
+        pool_id = self.bridge.connect({"connection_string": f"DATABASE={self.path}", "cache_ttl": 60})["pool_id"]
+        self.addCleanup(self.bridge.disconnect, pool_id)
+        original_fetchall = odbc_bridge.TypeConvertingCursor.fetchall
+        writes = []
+
+        def fetchall_then_write(cursor):
+            rows = original_fetchall(cursor)
+            if not writes:
+                # Another request commits a write while this query is still running.
+                writes.append(self.bridge.execute(pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", [7, "new"]))
+            return rows
+
+        odbc_bridge.TypeConvertingCursor.fetchall = fetchall_then_write
+        try:
+            self.assertEqual(self.bridge.query(pool_id, "SELECT id FROM items")["rows"], [])
+        finally:
+            odbc_bridge.TypeConvertingCursor.fetchall = original_fetchall
+
+        self.assertEqual(writes[0]["status"], "ok", writes)
+        self.assertEqual(self.bridge.query(pool_id, "SELECT id FROM items")["rows"], [(7,)])
+
+    def test_connection_parked_by_another_thread_is_reused(self):
+        pool_id = self.bridge.connect({"connection_string": f"DATABASE={self.path}", "max_pool_size": 1})["pool_id"]
+        self.addCleanup(self.bridge.disconnect, pool_id)
+        results = []
+        worker = threading.Thread(target=lambda: results.append(self.bridge.ping(pool_id)))
+        worker.start()
+        worker.join()
+        self.assertEqual(results[0]["status"], "ok", results)
+
+        pool = self.bridge._pools[pool_id]
+        self.assertEqual(pool.available_count, 1)
+        self.assertEqual(self.bridge.ping(pool_id)["status"], "ok")
+        self.assertEqual(pool.active_count, 1)
+
+    def test_cached_statement_picks_up_new_columns(self):
+        self.bridge.execute(self.pool_id, "INSERT INTO items (id, name) VALUES (?, ?)", [1, "a"])
+        before = self.bridge.query(self.pool_id, "SELECT * FROM items")
+        self.assertEqual(before["columns"], ["id", "name"])
+
+        self.bridge.execute(self.pool_id, "ALTER TABLE items ADD COLUMN price REAL")
+        after = self.bridge.query(self.pool_id, "SELECT * FROM items")
+        self.assertEqual(after["columns"], ["id", "name", "price"])
+        self.assertEqual(after["rows"], [(1, "a", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
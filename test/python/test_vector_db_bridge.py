@@ -0,0 +1,73 @@
+"""
+Tests for priv/python/vector_db_bridge.py against the in-memory backend.
+
+Run with: python -m unittest discover -s test/python
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "priv", "python"))
+
+import numpy as np  # noqa: E402
+
+from vector_db_bridge import VectorDBBridge, _top_k_indices  # noqa: E402
+
+
+class SemanticCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = VectorDBBridge(backend="memory", dimensions=2, semantic_cache_threshold=0.9)
+
+    def _search_ids(self, query, top_k=1):
+        return [r.id for r in self.bridge.search(query, top_k=top_k)]
+
+    def test_search_after_write_is_not_served_stale_results(self):
+        self.bridge.add("a1", [1.0, 0.0], {})
+        self.assertEqual(self._search_ids([1.0, 0.0]), ["a1"])
+        # A near-identical query is answered by the semantic cache...
+        self.assertEqual(self._search_ids([1.0, 0.01]), ["a1"])
+
+        # ...until a write changes what the collection would return.
+        self.bridge.add("a2", [1.0, 0.01], {})
+        self.assertEqual(self._search_ids([1.0, 0.011]), ["a2"])
+
+        self.bridge.delete("a2")
+        self.assertEqual(self._search_ids([1.0, 0.012]), ["a1"])
+
+        self.bridge.update_metadata("a1", {"tag": "x"})
+        self.assertEqual(self.bridge.search([1.0, 0.013], top_k=1)[0].metadata, {"tag": "x"})
+
+
+class MemoryBackendTest(unittest.TestCase):
+    def test_empty_store_accepts_a_new_dimension(self):
+        for dtype in ("float32", "float16", "int8"):
+            with self.subTest(dtype=dtype):
+                bridge = VectorDBBridge(backend="memory", dimensions=2, embedding_dtype=dtype)
+                bridge.add("a", [1.0, 0.0], {})
+                bridge.delete("a")
+
+                bridge.add("b", [0.0] * 63 + [1.0], {})
+                self.assertEqual([r.id for r in bridge.search([0.0] * 63 + [1.0], top_k=1)], ["b"])
+                self.assertEqual(len(bridge.get("b")["embedding"]), 64)
+
+
+class TopKTieBreakTest(unittest.TestCase):
+    def test_ties_at_the_cutoff_are_broken_by_id(self):
+        ids = list("zyxwvutsrqponmlkjihgfedcba")
+        order = _top_k_indices(np.ones(len(ids), dtype=np.float32), 2, ids)
+        self.assertEqual([ids[i] for i in order], ["a", "b"])
+
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1], dtype=np.float32)
+        order = _top_k_indices(scores, 3, ["d", "e", "c", "a", "b"])
+        self.assertEqual(order, [1, 3, 2])
+
+    def test_memory_search_returns_lowest_ids_among_equal_scores(self):
+        bridge = VectorDBBridge(backend="memory", dimensions=2)
+        for doc_id in "zyxwvutsrqponmlkjihgfedcba":
+            bridge.add(doc_id, [1.0, 0.0], {})
+        self.assertEqual([r.id for r in bridge.search([1.0, 0.0], top_k=2)], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for priv/python/vector_db_protocol.py against the in-memory backend.
+
+Run with: python -m unittest discover -s test/python
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "priv", "python"))
+
+from vector_db_protocol import handle_request  # noqa: E402
+
+
+def _call(method, **params):
+    response = handle_request({"method": method, "params": params})
+    assert response["status"] == "ok", response
+    return response
+
+
+class VectorDBProtocolTest(unittest.TestCase):
+    def setUp(self):
+        self.states = []
+
+    def tearDown(self):
+        for state in self.states:
+            _call("close", state=state)
+
+    def _init(self, collection):
+        state = _call("init", backend="memory", config={"collection": collection, "dimensions": 2})["state"]
+        self.states.append(state)
+        return state
+
+    def _search_ids(self, state, query):
+        return [r["id"] for r in _call("search", state=state, query=query, top_k=5)["results"]]
+
+    def test_search_results_are_scoped_to_the_collection(self):
+        a = self._init("protocol_test_a")
+        b = self._init("protocol_test_b")
+        _call("add", state=a, id="a1", embedding=[1.0, 0.0], metadata={})
+
+        self.assertEqual(self._search_ids(a, [1.0, 0.0]), ["a1"])
+        self.assertEqual(self._search_ids(b, [1.0, 0.0]), [])
+
+    def test_writes_invalidate_cached_results(self):
+        state = self._init("protocol_test_writes")
+        _call("add", state=state, id="a1", embedding=[1.0, 0.0], metadata={})
+        self.assertEqual(self._search_ids(state, [1.0, 0.0]), ["a1"])
+
+        _call("add", state=state, id="a2", embedding=[1.0, 0.1], metadata={})
+        _call("delete", state=state, id="a1")
+        self.assertEqual(self._search_ids(state, [1.0, 0.0]), ["a2"])
+
+        _call("add_batch", state=state, documents=[{"id": "a3", "embedding": [1.0, 0.0]}])
+        self.assertEqual(self._search_ids(state, [1.0, 0.0]), ["a3", "a2"])
+
+        _call("update_metadata", state=state, id="a3", metadata={"tag": "x"})
+        results = _call("search", state=state, query=[1.0, 0.0], top_k=1)["results"]
+        self.assertEqual(results[0]["metadata"], {"tag": "x"})
+
+
+if __name__ == "__main__":
+    unittest.main()